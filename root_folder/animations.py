@@ -0,0 +1,147 @@
+from manim import *
+from manim.mobject.types.image_mobject import AbstractImageMobject
+
+from hilbert import refinementParents
+from paths import cornersToBezier, cornerVertices
+
+
+class IndexedMoveAlongPath(Animation):
+    # MoveAlongPath that looks positions up in an ArcLengthIndex instead of
+    # recomputing point_from_proportion on every frame
+    def __init__(self, mobject, index, suspend_mobject_updating=False, **kwargs):
+        self.index = index
+        super().__init__(mobject, suspend_mobject_updating=suspend_mobject_updating, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.move_to(self.index.pointFromProportion(self.rate_func(alpha)))
+
+
+def staggeredAlphas(alpha, count, lag_ratio):
+    # per element progress with the same timing LaggedStart gives its sub animations
+    fullLength = (count - 1) * lag_ratio + 1
+    starts = np.arange(count) * lag_ratio
+    return np.clip(alpha * fullLength - starts, 0, 1)
+
+
+class OrderedReveal(Animation):
+    # fades the elements of a group in one after another as a single animation.
+    # elements join the scene when their turn starts and only elements whose progress
+    # changed are touched on a frame, so the cost per frame follows the active elements
+    def __init__(self, group, order=None, lag_ratio=1, **kwargs):
+        self.group = group
+        self.order = np.arange(len(group)) if order is None else np.asarray(order)
+        super().__init__(Group(), lag_ratio=lag_ratio, **kwargs)
+
+    def begin(self):
+        self.progress = np.zeros(len(self.order))
+        self.opacities = {}
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        alphas = staggeredAlphas(alpha, len(self.order), self.lag_ratio)
+        for rank in np.flatnonzero(alphas != self.progress):
+            element = self.group[self.order[rank]]
+            if rank not in self.opacities:
+                self.mobject.add(element)
+                self.opacities[rank] = self.opacityState(element)
+            self.applyOpacity(self.opacities[rank], self.rate_func(alphas[rank]))
+        self.progress = alphas
+
+    def opacityState(self, mobject):
+        state = []
+        for member in mobject.get_family():
+            if isinstance(member, VMobject):
+                state.append((member, member.get_fill_opacity(), member.get_stroke_opacity()))
+            elif isinstance(member, AbstractImageMobject):
+                state.append((member, member.get_pixel_array()[:, :, 3].copy(), None))
+        return state
+
+    def applyOpacity(self, state, alpha):
+        for member, fill, stroke in state:
+            if stroke is None:
+                member.get_pixel_array()[:, :, 3] = (fill * alpha).astype(np.uint8)
+            else:
+                member.set_fill(opacity=fill * alpha, family=False)
+                member.set_stroke(opacity=stroke * alpha, family=False)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.remove(self.mobject)
+        scene.add(self.group)
+
+
+class OrderedMove(Animation):
+    # moves the elements of a group to their targets one after another, scaling each by
+    # scale_factor on the way. start states are kept as arrays instead of a copy of the group
+    def __init__(self, group, order, targets, scale_factor=1, lag_ratio=1, **kwargs):
+        self.order = np.asarray(order)
+        self.targets = np.asarray(targets, dtype=float)
+        self.scale_factor = scale_factor
+        super().__init__(group, lag_ratio=lag_ratio, **kwargs)
+
+    def create_starting_mobject(self):
+        return Mobject()
+
+    def begin(self):
+        elements = [self.mobject[index] for index in self.order]
+        self.starts = np.array([element.get_center() for element in elements])
+        self.widths = np.array([element.width for element in elements])
+        self.progress = np.zeros(len(self.order))
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        alphas = staggeredAlphas(alpha, len(self.order), self.lag_ratio)
+        for rank in np.flatnonzero(alphas != self.progress):
+            element = self.mobject[self.order[rank]]
+            a = self.rate_func(alphas[rank])
+            element.scale(self.widths[rank] * (1 + (self.scale_factor - 1) * a) / element.width)
+            element.move_to(self.starts[rank] + (self.targets[rank] - self.starts[rank]) * a)
+        self.progress = alphas
+
+
+class MorphCorners(Animation):
+    # straight line interpolation of a corner path's points to new corner positions. this is the
+    # motion .animate.rotate/.apply_matrix give, without building a target mobject to get there
+    def __init__(self, mobject, corners, **kwargs):
+        self.endPoints = cornersToBezier(corners)
+        super().__init__(mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        return Mobject()
+
+    def begin(self):
+        self.startPoints = self.mobject.points.copy()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.points = self.startPoints + (self.endPoints - self.startPoints) * self.rate_func(alpha)
+
+
+class RefineCurve(MorphCorners):
+    # order n to order n + 1 Hilbert curve. every vertex starts on its parent vertex and spreads out
+    # to its four children, so both ends have the same point count and no alignment is needed
+    def __init__(self, mobject, target, **kwargs):
+        corners = cornerVertices(target)
+        self.vertexCount = len(corners)
+        super().__init__(mobject, corners, **kwargs)
+
+    def begin(self):
+        corners = cornerVertices(self.mobject)
+        order = int(round(np.log(len(corners)) / np.log(4)))
+        if 4 ** order != len(corners) or 4 ** (order + 1) != self.vertexCount:
+            raise ValueError(f"RefineCurve needs consecutive curve orders, got {len(corners)} and {self.vertexCount} vertices")
+        self.mobject.points = cornersToBezier(corners[refinementParents(order)])
+        super().begin()
+
+
+class RevealRaster(Animation):
+    # Create for a RasterCurve, every frame only writes the pixels of newly reached segments
+    def create_starting_mobject(self):
+        return Mobject()
+
+    def begin(self):
+        self.mobject.reveal(0)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.reveal(self.rate_func(alpha))
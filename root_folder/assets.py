@@ -0,0 +1,76 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image as PILImage
+
+# maps can be far bigger than PIL's decompression bomb limit
+PILImage.MAX_IMAGE_PIXELS = None
+
+
+def shownHeight(spec, sourceHeight, pixelHeight, frameHeight, resolution):
+    # output pixels the image covers: "scale" is relative to ImageMobject's default size at
+    # `resolution`, "height" is a height in scene units
+    if "height" in spec:
+        return spec["height"] * pixelHeight / frameHeight
+    return sourceHeight * spec.get("scale", 1) * pixelHeight / resolution
+
+
+def decodeAsset(path, spec, pixelHeight, frameHeight, resolution):
+    # RGBA array no taller than it is shown, and the scale_to_resolution that keeps the mobject the
+    # same size in scene units as the full image would have been
+    image = PILImage.open(path)
+    sourceHeight = image.height
+    height = int(np.clip(round(shownHeight(spec, sourceHeight, pixelHeight, frameHeight, resolution)), 1, sourceHeight))
+    width = max(1, round(image.width * height / sourceHeight))
+    # jpeg can decode straight at a fraction of the size
+    image.draft("RGBA", (width, height))
+    image = image.convert("RGBA")
+    if image.height != height:
+        image = image.resize((width, height), PILImage.LANCZOS, reducing_gap=2.0)
+    pixels = np.asarray(image)
+    pixels.flags.writeable = False
+    if "height" in spec:
+        return pixels, height * frameHeight / spec["height"]
+    return pixels, height * resolution / (sourceHeight * spec.get("scale", 1))
+
+
+class AssetPreloader:
+    # decodes every image a scene uses on a thread pool while the scene starts up. decoded arrays
+    # are shared between scenes in the process and dropped when the file's mtime changes
+    decoded = {}
+    # decodes run on several pools' threads at once, the lock guards every look at decoded
+    lock = threading.Lock()
+
+    def __init__(self, assets, pixelHeight, frameHeight, resolution, directory=".", workers=None):
+        self.assets = assets
+        self.settings = (pixelHeight, frameHeight, resolution)
+        self.directory = directory
+        self.pool = ThreadPoolExecutor(max_workers=workers or min(len(assets), os.cpu_count() or 1) or 1)
+        self.futures = {name: self.pool.submit(self.decode, name) for name in assets}
+        self.pool.shutdown(wait=False)
+
+    def key(self, name):
+        path = os.path.join(self.directory, name)
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, repr(sorted(self.assets[name].items())), self.settings)
+
+    def decode(self, name):
+        key = self.key(name)
+        with AssetPreloader.lock:
+            if key in AssetPreloader.decoded:
+                return AssetPreloader.decoded[key]
+        # decoded outside the lock so the other images decode in parallel
+        result = decodeAsset(os.path.join(self.directory, name), self.assets[name], *self.settings)
+        with AssetPreloader.lock:
+            for stale in [cached for cached in AssetPreloader.decoded if cached[0] == key[0]]:
+                del AssetPreloader.decoded[stale]
+            AssetPreloader.decoded[key] = result
+        return result
+
+    def get(self, name):
+        # (pixels, scale_to_resolution), waits for the decode if it is still running
+        if name not in self.futures:
+            raise KeyError(f"{name} is not a preloaded asset, add it to IMAGE_ASSETS")
+        return self.futures[name].result()
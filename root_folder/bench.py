@@ -0,0 +1,173 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from hilbert import hilbertPoints
+from spatial import HilbertIndex
+from tiles import squareCrop, tileViews
+
+SUITES = ["curves", "tiles", "spatial", "sections"]
+# seconds: lower is better, fps: higher is better
+UNITS = {"s": 1, "fps": -1}
+
+
+def bestOf(repeat, function):
+    # seconds per call: one warm up call (lazy tables, caches), then the best of repeat timings
+    # of enough calls to fill autorange's 0.2s, so fast calls aren't lost in timer noise
+    function()
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def benchCurves(args):
+    results = {}
+    for order in range(1, args.max_order + 1):
+        seconds = bestOf(args.repeat, lambda: hilbertPoints(order, [-4, -2.5, 0], 0.4125))
+        results[f"curves/order_{order}"] = {"value": seconds, "unit": "s"}
+    return results
+
+
+def benchTiles(args):
+    # synthetic RGBA map, tiled the way split_map_image does it plus the one copy ImageMobject makes
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(args.image_size, args.image_size, 4), dtype=np.uint8)
+    results = {}
+    for grid in [4, 8, 16, 32, 64]:
+        def tile():
+            views = tileViews(squareCrop(pixels), grid, grid)
+            for r in range(grid):
+                for c in range(grid):
+                    np.array(views[r, c])
+        results[f"tiles/{grid}x{grid}"] = {"value": bestOf(args.repeat, tile), "unit": "s"}
+    return results
+
+
+class GridIndex:
+    # the naive baseline: points bucketed on a uniform grid, a query visits every bucket it touches
+    def __init__(self, points, size=256):
+        self.points = points
+        self.size = size
+        self.low = points.min(axis=0)
+        self.scale = size / np.maximum(points.max(axis=0) - self.low, 1e-12)
+        cells = self.cells(points)
+        buckets = cells[:, 0] * size + cells[:, 1]
+        self.ids = np.argsort(buckets, kind="stable")
+        self.offsets = np.searchsorted(buckets[self.ids], np.arange(size * size + 1))
+
+    def cells(self, points):
+        return np.clip(((points - self.low) * self.scale).astype(np.int64), 0, self.size - 1)
+
+    def query(self, low, high):
+        (x0, y0), (x1, y1) = self.cells(np.array([low, high]))
+        ids = [self.ids[self.offsets[x * self.size + y0]:self.offsets[x * self.size + y1 + 1]] for x in range(x0, x1 + 1)]
+        ids = np.concatenate(ids)
+        inside = ((self.points[ids] >= low) & (self.points[ids] <= high)).all(axis=1)
+        return ids[inside]
+
+
+def benchSpatial(args):
+    # rectangles of up to 1% of the area over uniform random points
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1, size=(args.points, 2))
+    lows = rng.uniform(0, 0.9, size=(args.queries, 2))
+    highs = lows + rng.uniform(0, 0.1, size=(args.queries, 2))
+    results = {"spatial/load_hilbert": {"value": bestOf(args.repeat, lambda: HilbertIndex(points)), "unit": "s"}}
+    results["spatial/load_grid"] = {"value": bestOf(args.repeat, lambda: GridIndex(points)), "unit": "s"}
+    hilbertIndex, gridIndex = HilbertIndex(points), GridIndex(points)
+    queries = {
+        "hilbert": hilbertIndex.query,
+        "grid": gridIndex.query,
+        "linear": lambda low, high: np.flatnonzero(((points >= low) & (points <= high)).all(axis=1)),
+    }
+    for name, query in queries.items():
+        seconds = bestOf(args.repeat, lambda: [query(low, high) for low, high in zip(lows, highs)])
+        results[f"spatial/query_{name}"] = {"value": seconds / args.queries, "unit": "s"}
+    return results
+
+
+def benchSections(args):
+    # frames per second at low quality, written to nowhere so only scene and renderer are timed
+    from manim import tempconfig
+    from sections import sectionScene
+
+    results = {}
+    for name in args.sections.split(","):
+        options = {"quality": "low_quality", "disable_caching": True, "write_to_movie": False, "media_dir": args.media_dir}
+        with tempconfig(options):
+            scene = sectionScene(name)()
+            started = time.perf_counter()
+            scene.render()
+            seconds = time.perf_counter() - started
+            frames = scene.renderer.time * scene.camera.frame_rate
+        results[f"sections/{name}"] = {"value": frames / seconds, "unit": "fps"}
+    return results
+
+
+BENCHMARKS = {"curves": benchCurves, "tiles": benchTiles, "spatial": benchSpatial, "sections": benchSections}
+
+
+def run(args):
+    results = {}
+    for suite in args.suites.split(","):
+        results.update(BENCHMARKS[suite](args))
+        for name, result in results.items():
+            if name.startswith(suite + "/"):
+                print(f"{name:32} {result['value']:12.6f} {result['unit']}")
+    return {"python": sys.version.split()[0], "machine": platform.machine(), "numpy": np.__version__, "results": results}
+
+
+def compare(baseline, current, threshold):
+    # a benchmark regresses when it is more than threshold worse than the baseline
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before, after = baseline["results"][name]["value"], result["value"]
+        direction = UNITS[result["unit"]]
+        change = (after - before) / before * direction if before else 0.0
+        status = "REGRESSED" if change > threshold else "ok"
+        print(f"{name:32} {before:12.6f} -> {after:12.6f} {result['unit']:3} {change:+7.1%} {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for curve generation, tiling and section rendering.")
+    parser.add_argument("mode", choices=["run", "compare"])
+    parser.add_argument("baseline", nargs="?", default="bench_baseline.json", help="JSON written by run, read by compare")
+    parser.add_argument("--suites", default="curves,tiles", help=f"comma separated subset of {', '.join(SUITES)}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before compare fails, 0.25 = 25%%")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-order", type=int, default=12)
+    parser.add_argument("--image-size", type=int, default=4096)
+    parser.add_argument("--points", type=int, default=1_000_000, help="points loaded by the spatial suite")
+    parser.add_argument("--queries", type=int, default=200, help="range queries timed by the spatial suite")
+    parser.add_argument("--sections", default="hilbertHistory,hilbertConstruction,applications")
+    parser.add_argument("--media-dir", default="media")
+    args = parser.parse_args()
+
+    unknown = [suite for suite in args.suites.split(",") if suite not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+    if args.mode == "run":
+        with open(args.baseline, "w") as file:
+            json.dump(run(args), file, indent=2)
+        print(f"wrote {args.baseline}")
+        return
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(baseline, run(args), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed past {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import ast
+import hashlib
+import importlib.metadata
+import os
+import re
+import shutil
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from hilbert import hilbertPoints
+
+
+class DiskStore:
+    # directory of cached files kept under a byte budget, least recently used files go first
+    def __init__(self, directory, maxBytes, suffix):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.suffix = suffix
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def entries(self):
+        # (path, size, last use) sorted oldest first
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((os.path.join(self.directory, name), stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def touch(self, path):
+        os.utime(path)
+
+    def write(self, key, writeFile):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        partial = f"{path}.{os.getpid()}.partial"
+        with open(partial, "wb") as file:
+            writeFile(file)
+        os.replace(partial, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, maxBytes=None, keep=None):
+        maxBytes = self.maxBytes if maxBytes is None else maxBytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for path, size, _ in entries:
+            if total <= maxBytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            removed.append(path)
+        return removed
+
+
+class CurveCache:
+    # in-process LRU in front of a directory of .npy files that are memory mapped on reload
+    def __init__(self, directory=os.path.join("media", "curve_cache"), maxBytes=512 * 1024 ** 2, maxEntries=16):
+        self.store = DiskStore(directory, maxBytes, ".npy")
+        self.maxEntries = maxEntries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # files written by an older curve engine must not be served after hilbert.py changes
+        self.engine = fileDigest(os.path.join(HERE, "hilbert.py"))
+
+    def key(self, order, startPoint, step):
+        startPoint = tuple(float(value) for value in startPoint)
+        return hashlib.sha1(repr((self.engine, order, startPoint, float(step))).encode()).hexdigest()
+
+    def get(self, order, startPoint, step):
+        key = self.key(order, startPoint, step)
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        path = self.store.path(key)
+        if os.path.exists(path):
+            self.hits += 1
+            self.store.touch(path)
+            points = np.load(path, mmap_mode="r")
+        else:
+            self.misses += 1
+            points = hilbertPoints(order, startPoint, step)
+            self.store.write(key, lambda file: np.save(file, points))
+            points.flags.writeable = False
+        self.memory[key] = points
+        while len(self.memory) > self.maxEntries:
+            self.memory.popitem(last=False)
+        return points
+
+    def clear(self):
+        self.memory.clear()
+        self.store.evict(maxBytes=0)
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# section scenes are built by sections.py on top of main.py, everything they import can change the frames
+SCENE_MODULES = ["main", "sections"]
+# DefaultTemplate methods every section scene runs besides its own
+SECTION_ENTRY = ["setup", "enterSection", "runSection"]
+# f-string names like the saved crops are outputs, not inputs
+IMAGE_PATTERN = re.compile(r"[\"']([^\"'{}]+\.(?:png|jpe?g|gif|bmp|npy))[\"']", re.IGNORECASE)
+
+
+def imageReferences(source):
+    # file names of images mentioned as string literals, in order of first appearance
+    return list(dict.fromkeys(IMAGE_PATTERN.findall(source)))
+
+
+def fileDigest(path):
+    digest = hashlib.sha256()
+    if not os.path.exists(path):
+        digest.update(b"missing")
+        return digest.hexdigest()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def localModules(roots, root=HERE):
+    # every module file in root reached from the roots through imports, including the ones made
+    # inside functions, found with ast so nothing gets imported
+    pending, seen = list(roots), []
+    while pending:
+        name = pending.pop()
+        path = os.path.join(root, name + ".py")
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.append(name)
+        with open(path) as file:
+            tree = ast.parse(file.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split(".")[0])
+    return sorted(seen)
+
+
+def manimVersion():
+    try:
+        return importlib.metadata.version("manim")
+    except importlib.metadata.PackageNotFoundError:
+        return "missing"
+
+
+def sceneSources(filename, className="DefaultTemplate"):
+    # method name -> source of the scene class, plus everything in the file outside it under ""
+    with open(filename) as file:
+        text = file.read()
+    tree = ast.parse(text)
+    methods, outside = {}, []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == className:
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    methods[item.name] = ast.get_source_segment(text, item)
+                else:
+                    outside.append(ast.get_source_segment(text, item))
+        else:
+            outside.append(ast.get_source_segment(text, node))
+    methods[""] = "\n".join(outside)
+    return methods
+
+
+def sectionSources(name, filename):
+    # the section method and every self.method it reaches, read from the source without importing manim
+    methods = sceneSources(filename)
+    pending, seen = [name, *SECTION_ENTRY], []
+    while pending:
+        method = pending.pop()
+        if method in seen or method not in methods:
+            continue
+        seen.append(method)
+        pending.extend(re.findall(r"self\.(\w+)\(", methods[method]))
+    return {method: methods[method] for method in ["", *sorted(seen)]}
+
+
+class SectionCache:
+    # finished section videos keyed on everything that goes into them: the section's code, the helper
+    # modules, the images it reads and the render config. unchanged sections are reused whole
+    def __init__(self, directory=os.path.join("media", "section_cache"), maxBytes=4 * 1024 ** 3, root=HERE):
+        self.store = DiskStore(directory, maxBytes, ".mp4")
+        self.root = root
+
+    def key(self, name, quality=None):
+        digest = hashlib.sha256()
+        sources = sectionSources(name, os.path.join(self.root, "main.py"))
+        for method, source in sources.items():
+            digest.update(f"{method}\0{source}\0".encode())
+        # main.py itself only counts through the methods above, so one section's edits leave the others cached
+        for module in localModules(SCENE_MODULES, self.root):
+            if module != "main":
+                digest.update(f"{module}\0{fileDigest(os.path.join(self.root, module + '.py'))}\0".encode())
+        # module level code lists every asset, only the images the section's own methods name count
+        methodSources = [source for method, source in sources.items() if method]
+        for image in imageReferences("\n".join(methodSources)):
+            digest.update(f"{image}\0{fileDigest(os.path.join(self.root, image))}\0".encode())
+        digest.update(f"{quality}\0{fileDigest(os.path.join(self.root, 'manim.cfg'))}\0{manimVersion()}".encode())
+        # the section name leads so list can tell entries apart
+        return f"{name}-{digest.hexdigest()[:24]}"
+
+    def get(self, key):
+        path = self.store.path(key)
+        if not os.path.exists(path):
+            return None
+        self.store.touch(path)
+        return path
+
+    def put(self, key, moviePath):
+        def copy(file):
+            with open(moviePath, "rb") as movie:
+                shutil.copyfileobj(movie, file)
+        return self.store.write(key, copy)
+
+
+def formatBytes(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or prune the section video and curve caches.")
+    parser.add_argument("command", choices=["list", "prune"])
+    parser.add_argument("--cache", choices=["sections", "curves", "all"], default="all")
+    parser.add_argument("--max-bytes", type=float, help="prune down to this many bytes, defaults to each cache's budget, 0 empties it")
+    args = parser.parse_args()
+
+    stores = {}
+    if args.cache in ("sections", "all"):
+        stores["sections"] = SectionCache().store
+    if args.cache in ("curves", "all"):
+        stores["curves"] = CurveCache().store
+    for label, store in stores.items():
+        entries = store.entries()
+        if args.command == "prune":
+            removed = store.evict(None if args.max_bytes is None else int(args.max_bytes))
+            print(f"{label}: removed {len(removed)} of {len(entries)} entries")
+            continue
+        total = sum(size for _, size, _ in entries)
+        print(f"{label}: {len(entries)} entries, {formatBytes(total)} of {formatBytes(store.maxBytes)} in {store.directory}")
+        # most recently used first
+        for path, size, used in reversed(entries):
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(used))
+            print(f"  {stamp} {formatBytes(size):>10} {os.path.basename(path)}")
+
+
+if __name__ == "__main__":
+    main()
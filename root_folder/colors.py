@@ -0,0 +1,41 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+def colorToRGB(color):
+    # manim colours are hex strings or ManimColor objects that print as hex
+    value = str(color).lstrip("#")
+    if len(value) in (3, 4):
+        value = "".join(character * 2 for character in value)
+    return [int(value[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+
+
+@lru_cache(maxsize=64)
+def cachedGradient(palette, count):
+    rgbs = np.array([colorToRGB(color) for color in palette])
+    rgbas = np.ones((count, 4))
+    if len(rgbs) == 1 or count == 1:
+        rgbas[:, :3] = rgbs[0]
+    else:
+        # same spacing as manim's color_gradient, in one pass
+        alphas = np.linspace(0, len(rgbs) - 1, count)
+        floors = np.minimum(alphas.astype(int), len(rgbs) - 2)
+        rgbas[:, :3] = rgbs[floors] + (rgbs[floors + 1] - rgbs[floors]) * (alphas - floors)[:, None]
+    rgbas.flags.writeable = False
+    return rgbas
+
+
+def gradientRGBA(palette, count):
+    # (count, 4) rgba array, memoized on (palette, count) and read only, copy before editing
+    return cachedGradient(tuple(str(color) for color in palette), count)
+
+
+def setHilbertGradient(mobject, palette, count=None):
+    # stroke colours for a corner path, one per vertex (Hilbert index) unless count says otherwise
+    if count is None:
+        count = len(mobject.points) // mobject.n_points_per_cubic_curve + 1
+    rgbas = gradientRGBA(palette, count).copy()
+    rgbas[:, 3] = mobject.get_stroke_opacity()
+    mobject.stroke_rgbas = rgbas
+    return mobject
@@ -0,0 +1,55 @@
+import numpy as np
+
+# the four quarter copies in drawing order (DL, UL, UR, DR) and how much each one is turned
+# before it is mirrored top to bottom, the same moves the construction section animates
+QUADRANT_DIRECTIONS = np.array([[-1, -1, 0], [-1, 1, 0], [1, 1, 0], [1, -1, 0]], dtype=float)
+QUADRANT_ANGLES = [-np.pi / 2, 0, 0, np.pi / 2]
+REFLECTION = np.diag([1.0, -1.0, 1.0])
+
+
+def rotationMatrix(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def orderOneCorners(side):
+    # order 1 path through the centres of the four quarters, starting bottom left
+    return QUADRANT_DIRECTIONS * side / 4
+
+
+def quadrantCentres(side, centre=(0, 0, 0)):
+    return QUADRANT_DIRECTIONS * side / 4 + np.asarray(centre, dtype=float)
+
+
+def constructionKeyframes(corners, side, centre=(0, 0, 0)):
+    # corners of an order n curve filling a side x side square around centre -> corner arrays of
+    # every stage of building order n + 1 from four half size copies:
+    #   move    (4, N, 3) copies shrunk and moved into their quarter
+    #   rotate  (4, N, 3) after turning the bottom copies a quarter turn
+    #   reflect (4, N, 3) after mirroring the bottom copies top to bottom
+    #   joined  (4N, 3)   the order n + 1 corners, copies joined in drawing order
+    centre = np.asarray(centre, dtype=float)
+    half = (np.asarray(corners, dtype=float) - centre) * 0.5
+    move, rotate, reflect = [], [], []
+    for quadrantCentre, angle in zip(quadrantCentres(side, centre), QUADRANT_ANGLES):
+        turned = half @ rotationMatrix(angle).T
+        mirrored = turned @ REFLECTION.T if angle else turned
+        move.append(half + quadrantCentre)
+        rotate.append(turned + quadrantCentre)
+        reflect.append(mirrored + quadrantCentre)
+    reflect = np.array(reflect)
+    return {
+        "move": np.array(move),
+        "rotate": np.array(rotate),
+        "reflect": reflect,
+        "joined": reflect.reshape(-1, 3),
+    }
+
+
+def constructionSequence(maxOrder, side, centre=(0, 0, 0)):
+    # (order, keyframes building it) for orders 2..maxOrder, only arrays are passed between orders
+    corners = orderOneCorners(side) + np.asarray(centre, dtype=float)
+    for order in range(2, maxOrder + 1):
+        keyframes = constructionKeyframes(corners, side, centre)
+        yield order, keyframes
+        corners = keyframes["joined"]
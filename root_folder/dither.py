@@ -0,0 +1,120 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from hilbert import hilbertIndexToXY
+from tiles import memoryMappedImage
+
+# Riemer's error diffusion along the Hilbert curve: the last SIZE quantization errors are kept,
+# the newest weighs MAX times as much as the oldest, growing exponentially in between
+SIZE = 16
+MAX = 16
+
+
+def riemerWeights(size=SIZE, maximum=MAX):
+    # oldest first, rounded to integers like the original
+    m = np.exp(np.log(maximum) / (size - 1))
+    return np.floor(m ** np.arange(size) + 0.5)
+
+
+def curveOffsets(order):
+    # flat offsets into a (2 ** order) square tile in the order the curve visits them
+    x, y = hilbertIndexToXY(order, np.arange(4 ** order))
+    return y.astype(np.int64) * (1 << order) + x
+
+
+def toGray(pixels):
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        return pixels.astype(np.float32)
+    rgb = pixels[..., :3].astype(np.float32)
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def ditherTiles(lanes, order):
+    # lanes: (count, side * side) pixels of independent tiles. every tile is walked along the curve
+    # with its own error queue, all tiles advance one pixel per step so each step is one vector op
+    weights = riemerWeights()
+    # the queue is a ring, phase k puts the oldest error in slot k % SIZE
+    phaseWeights = np.stack([np.roll(weights, phase) for phase in range(SIZE)]).astype(np.float32)
+    errors = np.zeros((SIZE, len(lanes)), dtype=np.float32)
+    output = np.empty(lanes.shape, dtype=np.uint8)
+    for step, offset in enumerate(curveOffsets(order)):
+        phase = step % SIZE
+        value = lanes[:, offset]
+        adjusted = value + phaseWeights[phase] @ errors / MAX
+        quantized = np.where(adjusted >= 128, 255, 0).astype(np.uint8)
+        errors[phase] = value - quantized
+        output[:, offset] = quantized
+    return output
+
+
+def ditherArray(gray, order=6):
+    # 2D float array -> 0/255 uint8 of the same shape, tiles of 2 ** order pixels on a side
+    side = 1 << order
+    height, width = gray.shape
+    rows, cols = -(-height // side), -(-width // side)
+    # pad with edge pixels so the border tiles are full, the padding is cut off again below
+    padded = np.pad(gray, ((0, rows * side - height), (0, cols * side - width)), mode="edge")
+    lanes = padded.reshape(rows, side, cols, side).transpose(0, 2, 1, 3).reshape(rows * cols, side * side)
+    dithered = ditherTiles(lanes, order)
+    return dithered.reshape(rows, cols, side, side).transpose(0, 2, 1, 3).reshape(rows * side, cols * side)[:height, :width]
+
+
+def ditherBand(path, top, bottom, order):
+    # worker side: one band of tile rows straight from the memory mapped decode
+    return ditherArray(toGray(memoryMappedImage(path)[top:bottom]), order)
+
+
+def ditherFile(path, output, order=6, bandTiles=8, workers=None):
+    # dithers an image of any size into a binary PGM, band by band, never holding the whole output
+    height, width = memoryMappedImage(path).shape[:2]
+    band = bandTiles << order
+    bands = [(top, min(height, top + band)) for top in range(0, height, band)]
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context("spawn")
+    with open(output, "wb") as file, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        file.write(f"P5\n{width} {height}\n255\n".encode())
+        # a few bands in flight per worker, written in order as they finish
+        pending = []
+        for top, bottom in bands:
+            pending.append(pool.submit(ditherBand, path, top, bottom, order))
+            if len(pending) >= 2 * workers:
+                file.write(pending.pop(0).result().tobytes())
+        for future in pending:
+            file.write(future.result().tobytes())
+    return width, height
+
+
+def ditherFrames(pixels, order=4):
+    # before/after RGBA frames for the Dithering section: the image as it is and its dither
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = np.dstack([pixels] * 3)
+    if pixels.shape[2] == 3:
+        pixels = np.dstack([pixels, np.full(pixels.shape[:2], 255, dtype=np.uint8)])
+    after = pixels.copy()
+    after[..., :3] = ditherArray(toGray(pixels), order)[..., None]
+    return pixels, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Riemer error diffusion dither along the Hilbert curve, written as a PGM.")
+    parser.add_argument("input")
+    parser.add_argument("output", help="binary PGM (.pgm)")
+    parser.add_argument("--tile-order", type=int, default=6, help="tiles of 2 ** order pixels on a side, walked in Hilbert order")
+    parser.add_argument("--band-tiles", type=int, default=8, help="tile rows per work item")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes, defaults to the core count")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    width, height = ditherFile(args.input, args.output, args.tile_order, args.band_tiles, args.jobs)
+    print(f"dithered {width}x{height} in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
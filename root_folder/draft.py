@@ -0,0 +1,95 @@
+import argparse
+import os
+from collections import defaultdict
+
+import numpy as np
+from PIL import Image as PILImage
+
+from sections import SECTIONS
+
+
+class DraftRecorder:
+    # stands in for play on a scene: every call jumps straight through a few keyframes instead of
+    # rendering each frame, and the keyframes are collected into one contact sheet per section
+    def __init__(self, scene, keyframes=2, thumbnailWidth=320):
+        self.scene = scene
+        self.keyframes = keyframes
+        self.thumbnailWidth = thumbnailWidth
+        self.sheets = defaultdict(list)
+        scene.play = self.play
+
+    def alphas(self):
+        # a single keyframe means only the final state
+        return [1.0] if self.keyframes == 1 else np.linspace(0, 1, self.keyframes)
+
+    def play(self, *args, **kwargs):
+        scene = self.scene
+        animations = scene.compile_animations(*args, **kwargs)
+        scene.add_mobjects_from_animations(animations)
+        for animation in animations:
+            animation._setup_scene(scene)
+            animation.begin()
+        # waits don't change anything worth a row on the sheet
+        drawn = any(type(animation).__name__ != "Wait" for animation in animations)
+        row = []
+        for alpha in self.alphas() if drawn else [1.0]:
+            for animation in animations:
+                animation.interpolate(alpha)
+            scene.update_mobjects(0)
+            if drawn:
+                row.append(self.snapshot())
+        for animation in animations:
+            animation.finish()
+            animation.clean_up_from_scene(scene)
+        scene.update_mobjects(0)
+        if row:
+            self.sheets[getattr(scene, "currentSection", "construct")].append(row)
+
+    def snapshot(self):
+        renderer = self.scene.renderer
+        renderer.update_frame(self.scene)
+        image = PILImage.fromarray(renderer.get_frame()).convert("RGB")
+        height = round(image.height * self.thumbnailWidth / image.width)
+        return image.resize((self.thumbnailWidth, height), PILImage.BILINEAR)
+
+    def write(self, directory):
+        # rows are play calls in order, columns are the keyframes of that call
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for section, rows in self.sheets.items():
+            gap = 4
+            width, height = rows[0][0].size
+            columns = max(len(row) for row in rows)
+            sheet = PILImage.new("RGB", (columns * (width + gap) + gap, len(rows) * (height + gap) + gap), (40, 40, 40))
+            for r, row in enumerate(rows):
+                for c, thumbnail in enumerate(row):
+                    sheet.paste(thumbnail, (gap + c * (width + gap), gap + r * (height + gap)))
+            path = os.path.join(directory, f"{section}.png")
+            sheet.save(path)
+            paths.append(path)
+        return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyframe-only preview of the video, saved as contact sheets.")
+    parser.add_argument("--sections", help=f"comma separated subset of {', '.join(SECTIONS)}, defaults to construct()")
+    parser.add_argument("-k", "--keyframes", type=int, default=2, help="keyframes per play call, 1 = final state only")
+    parser.add_argument("--width", type=int, default=320, help="thumbnail width in pixels")
+    parser.add_argument("-o", "--output", default=os.path.join("media", "draft"))
+    args = parser.parse_args()
+
+    os.environ["HILBERT_DRAFT"] = str(args.keyframes)
+    os.environ["HILBERT_DRAFT_WIDTH"] = str(args.width)
+    os.environ["HILBERT_DRAFT_DIR"] = args.output
+    from manim import tempconfig
+    from main import DefaultTemplate
+    from sections import sectionScene
+
+    scenes = [sectionScene(name.strip()) for name in args.sections.split(",")] if args.sections else [DefaultTemplate]
+    with tempconfig({"quality": "low_quality", "write_to_movie": False, "save_last_frame": False, "disable_caching": True}):
+        for scene in scenes:
+            scene().render()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from hilbert import checkOrder, hilbertIndexToXY, indexDtype
+
+# extension -> format, anything else needs --format
+EXTENSIONS = {".bin": "bin", ".npy": "npy", ".svg": "svg", ".csv": "csv"}
+# float32 are positions start + step * cell, uint32 the integer cells themselves
+DTYPES = {"float32": "<f4", "uint32": "<u4"}
+
+
+def iterVertices(order, start, step, dtype, chunkSize=1 << 20):
+    # (indices, (n, 2) vertices) chunks in curve order, no more than chunkSize at a time
+    total = 4 ** order
+    for first in range(0, total, chunkSize):
+        indices = np.arange(first, min(first + chunkSize, total), dtype=indexDtype(order))
+        x, y = hilbertIndexToXY(order, indices)
+        if dtype == "<u4":
+            yield indices, np.column_stack([x, y]).astype(dtype)
+        else:
+            yield indices, (np.column_stack([x, y]) * step + start).astype(dtype)
+
+
+def writeBin(file, chunks, count, dtype, bounds):
+    # x, y pairs back to back, no header
+    for _, vertices in chunks:
+        file.write(vertices.tobytes())
+
+
+def writeNpy(file, chunks, count, dtype, bounds):
+    # the header already knows the final shape, the data follows chunk by chunk
+    np.lib.format.write_array_header_1_0(file, {"descr": dtype, "fortran_order": False, "shape": (count, 2)})
+    writeBin(file, chunks, count, dtype, bounds)
+
+
+def writeCsv(file, chunks, count, dtype, bounds):
+    row = "%d,%d,%d\n" if dtype == "<u4" else "%d,%.9g,%.9g\n"
+    file.write(b"index,x,y\n")
+    for indices, vertices in chunks:
+        rows = np.column_stack([indices, vertices]).astype(np.int64 if dtype == "<u4" else np.float64)
+        file.write(((row * len(rows)) % tuple(rows.ravel())).encode())
+
+
+def writeSvg(file, chunks, count, dtype, bounds):
+    # one polyline, y flipped so the curve starts bottom left like in the video
+    left, bottom, right, top = bounds
+    margin = max(right - left, top - bottom) / 100 or 1
+    viewBox = f"{left - margin:g} {-top - margin:g} {right - left + 2 * margin:g} {top - bottom + 2 * margin:g}"
+    file.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewBox}">\n'.encode())
+    file.write(f'<polyline fill="none" stroke="black" stroke-width="{margin / 4:g}" points="'.encode())
+    point = "%d,%d " if dtype == "<u4" else "%.6g,%.6g "
+    for _, vertices in chunks:
+        flipped = vertices.astype(np.int64 if dtype == "<u4" else np.float64) * [1, -1]
+        file.write(((point * len(flipped)) % tuple(flipped.ravel())).encode())
+    file.write(b'"/>\n</svg>\n')
+
+
+WRITERS = {"bin": writeBin, "npy": writeNpy, "csv": writeCsv, "svg": writeSvg}
+
+
+def export(output, order, start=(0.0, 0.0), step=1.0, format=None, dtype="float32", chunkSize=1 << 20):
+    # writes every vertex of the order `order` curve to output, a path or "-" for stdout
+    format = format or EXTENSIONS.get(os.path.splitext(output)[1])
+    if format not in WRITERS:
+        raise ValueError(f"unknown format for {output}, pass one of {', '.join(WRITERS)}")
+    checkOrder(order)
+    dtype = DTYPES[dtype]
+    start = np.asarray(start, dtype=float)[:2]
+    chunks = iterVertices(order, start, step, dtype, chunkSize)
+    # the curve fills the square from its first vertex to 2 ** order - 1 steps up and right
+    reach = 2 ** order - 1
+    bounds = (0, 0, reach, reach) if dtype == "<u4" else (*start, *(start + reach * step))
+    if output == "-":
+        WRITERS[format](sys.stdout.buffer, chunks, 4 ** order, dtype, bounds)
+        sys.stdout.buffer.flush()
+        return
+    partial = f"{output}.{os.getpid()}.partial"
+    try:
+        with open(partial, "wb") as file:
+            WRITERS[format](file, chunks, 4 ** order, dtype, bounds)
+        os.replace(partial, output)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Hilbert curve vertices without loading manim.")
+    parser.add_argument("output", help='.bin, .npy, .svg or .csv file, "-" for stdout (needs --format)')
+    parser.add_argument("-n", "--order", type=int, required=True)
+    parser.add_argument("--start", type=float, nargs=2, default=[0.0, 0.0], metavar=("X", "Y"))
+    parser.add_argument("--step", type=float, default=1.0, help="distance between neighbouring vertices")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="defaults to the output's extension")
+    parser.add_argument("--dtype", choices=sorted(DTYPES), default="float32",
+                        help="little-endian positions, or the integer grid cells (start and step are ignored)")
+    parser.add_argument("--chunk", type=int, default=1 << 20, help="vertices generated and written at a time")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        export(args.output, args.order, args.start, args.step, args.format, args.dtype, args.chunk)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.output != "-":
+        print(f"wrote {4 ** args.order} vertices to {args.output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
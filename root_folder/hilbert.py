@@ -0,0 +1,276 @@
+import numpy as np
+
+# 2 * order bits have to fit in an int64 index
+MAX_ORDER = 31
+
+
+def checkOrder(order):
+    if order < 1 or order > MAX_ORDER:
+        raise ValueError(f"order must be between 1 and {MAX_ORDER}, got {order}")
+
+
+def indexDtype(order):
+    return np.uint32 if order <= 16 else np.uint64
+
+
+# quadrant transforms are (swap, flipX, flipY) acting on the 2x2 cell of one level
+IDENTITY = (0, 0, 0)
+TRANSPOSE = (1, 0, 0)
+ANTI_TRANSPOSE = (1, 1, 1)
+# quadrant digit -> (cell, transform of the sub curve), first move goes up
+BASE_CELLS = [(0, 0), (0, 1), (1, 1), (1, 0)]
+BASE_TRANSFORMS = [TRANSPOSE, IDENTITY, IDENTITY, ANTI_TRANSPOSE]
+# digits handled per table lookup
+TABLE_DIGITS = 8
+
+
+def applyTransform(transform, x, y):
+    swap, flipX, flipY = transform
+    if swap:
+        x, y = y, x
+    return x ^ flipX, y ^ flipY
+
+
+def composeTransforms(outer, inner):
+    cells = [applyTransform(outer, *applyTransform(inner, x, y)) for x, y in BASE_CELLS]
+    for swap in (0, 1):
+        for flipX in (0, 1):
+            for flipY in (0, 1):
+                candidate = (swap, flipX, flipY)
+                if [applyTransform(candidate, x, y) for x, y in BASE_CELLS] == cells:
+                    return candidate
+
+
+def buildTables(digits):
+    # each entry walks `digits` quadrant digits from one state: x bits, y bits and the next state
+    if digits > 1:
+        # wider tables are two narrower lookups chained together
+        high, low = TABLES[digits // 2], TABLES[digits - digits // 2]
+        lowDigits = digits - digits // 2
+        lowSize = 1 << (2 * lowDigits)
+        entries = np.arange(len(high[0]) << (2 * digits), dtype=np.uint32)
+        state = entries >> np.uint32(2 * digits)
+        chunk = entries & np.uint32((1 << (2 * digits)) - 1)
+        highEntry = (state << np.uint32(2 * (digits // 2))) | (chunk >> np.uint32(2 * lowDigits))
+        lowEntry = (high[3][highEntry] << np.uint32(2 * lowDigits)) | (chunk & np.uint32(lowSize - 1))
+        xTable = (high[1][highEntry] << np.uint32(lowDigits)) | low[1][lowEntry]
+        yTable = (high[2][highEntry] << np.uint32(lowDigits)) | low[2][lowEntry]
+        return high[0], xTable, yTable, low[3][lowEntry]
+    states = [IDENTITY]
+    for state in states:
+        for transform in BASE_TRANSFORMS:
+            child = composeTransforms(state, transform)
+            if child not in states:
+                states.append(child)
+    xTable = np.zeros(len(states) * 4, dtype=np.uint32)
+    yTable = np.zeros(len(states) * 4, dtype=np.uint32)
+    nextState = np.zeros(len(states) * 4, dtype=np.uint32)
+    for stateIndex, state in enumerate(states):
+        for digit in range(4):
+            entry = stateIndex * 4 + digit
+            xTable[entry], yTable[entry] = applyTransform(state, *BASE_CELLS[digit])
+            nextState[entry] = states.index(composeTransforms(state, BASE_TRANSFORMS[digit]))
+    return states, xTable, yTable, nextState
+
+
+def invertTables(digits):
+    # same tables keyed the other way round: (state, x bits, y bits) -> digits and next state
+    states, xTable, yTable, nextState = TABLES[digits]
+    size = 1 << (2 * digits)
+    entries = np.arange(len(states) * size, dtype=np.uint32)
+    state = entries >> np.uint32(2 * digits)
+    inverse = (state << np.uint32(2 * digits)) | (xTable << np.uint32(digits)) | yTable
+    digitTable = np.zeros_like(entries)
+    inverseNext = np.zeros_like(entries)
+    digitTable[inverse] = entries & np.uint32(size - 1)
+    inverseNext[inverse] = nextState
+    return digitTable, inverseNext
+
+
+class LazyTables(dict):
+    # digits -> tables, built the first time a curve needs them so importing this module stays cheap
+    def __init__(self, build):
+        super().__init__()
+        self.build = build
+
+    def __missing__(self, digits):
+        self[digits] = self.build(digits)
+        return self[digits]
+
+
+TABLES = LazyTables(buildTables)
+INVERSE_TABLES = LazyTables(invertTables)
+
+
+def hilbertIndexToXY(order, indices):
+    # closed form d -> (x, y): walks the quadrant digits top down, TABLE_DIGITS at a time
+    checkOrder(order)
+    dtype = indexDtype(order)
+    t = np.array(indices, dtype=dtype, ndmin=1)
+    x = np.zeros_like(t)
+    y = np.zeros_like(t)
+    state = np.zeros(t.shape, dtype=np.uint32)
+    remaining = order
+    while remaining:
+        digits = remaining % TABLE_DIGITS or TABLE_DIGITS
+        remaining -= digits
+        _, xTable, yTable, nextState = TABLES[digits]
+        entry = ((t >> dtype(2 * remaining)) & dtype((1 << (2 * digits)) - 1)).astype(np.uint32)
+        entry += state << np.uint32(2 * digits)
+        x <<= dtype(digits)
+        x |= xTable[entry]
+        y <<= dtype(digits)
+        y |= yTable[entry]
+        state = nextState[entry]
+    return x, y
+
+
+def hilbertXYToIndex(order, x, y):
+    # inverse of hilbertIndexToXY for integer grid coordinates in [0, 2 ** order)
+    checkOrder(order)
+    dtype = indexDtype(order)
+    x, y = np.broadcast_arrays(np.array(x, dtype=dtype, ndmin=1), np.array(y, dtype=dtype, ndmin=1))
+    if (x >> dtype(order)).any() or (y >> dtype(order)).any():
+        raise ValueError(f"coordinates must be smaller than {2 ** order} for order {order}")
+    d = np.zeros(x.shape, dtype=dtype)
+    state = np.zeros(x.shape, dtype=np.uint32)
+    remaining = order
+    while remaining:
+        digits = remaining % TABLE_DIGITS or TABLE_DIGITS
+        remaining -= digits
+        digitTable, inverseNext = INVERSE_TABLES[digits]
+        bits = dtype((1 << digits) - 1)
+        entry = state << np.uint32(2 * digits)
+        entry |= ((x >> dtype(remaining)) & bits).astype(np.uint32) << np.uint32(digits)
+        entry |= ((y >> dtype(remaining)) & bits).astype(np.uint32)
+        d <<= dtype(2 * digits)
+        d |= digitTable[entry]
+        state = inverseNext[entry]
+    return d
+
+
+def hilbertGridOrder(rows, cols):
+    # row-major tile indices (row 0 at the top) in the order the curve visits them,
+    # starting bottom left with the same orientation as hilbertPoints
+    order = max(1, int(np.ceil(np.log2(max(rows, cols)))))
+    row, col = np.divmod(np.arange(rows * cols), cols)
+    keys = hilbertXYToIndex(order, col, rows - 1 - row)
+    return np.argsort(keys, kind="stable")
+
+
+def refinementParents(order):
+    # vertex j of the order + 1 curve lies in the cell of vertex j // 4 of the order curve,
+    # so every vertex splits into the next four in Hilbert order
+    checkOrder(order + 1)
+    return np.arange(4 ** (order + 1), dtype=indexDtype(order + 1)) >> 2
+
+
+def hilbertPoints(order, startPoint, step, indices=None):
+    # same vertex sequence as the old L-system: starts at startPoint, ends (2 ** order - 1) steps to its right
+    if indices is None:
+        indices = np.arange(4 ** order, dtype=indexDtype(order))
+    x, y = hilbertIndexToXY(order, indices)
+    points = np.empty((len(x), 3))
+    points[:] = np.asarray(startPoint, dtype=float)
+    points[:, 0] += x * step
+    points[:, 1] += y * step
+    return points
+
+
+def iterHilbertPoints(order, startPoint, step, chunkSize=1 << 16):
+    # same vertices as hilbertPoints, produced lazily as (chunkSize, 3) arrays
+    checkOrder(order)
+    dtype = indexDtype(order)
+    total = 4 ** order
+    for start in range(0, total, chunkSize):
+        yield hilbertPoints(order, startPoint, step, np.arange(start, min(start + chunkSize, total), dtype=dtype))
+
+
+def iterHilbertVertices(order, startPoint, step, chunkSize=1 << 16):
+    # one [x, y, z] list at a time, like the entries the old getHilbertPoints returned
+    for chunk in iterHilbertPoints(order, startPoint, step, chunkSize):
+        yield from chunk.tolist()
+
+
+# N dimensional curves use Skilling's transpose algorithm ("Programming the Hilbert curve", 2004):
+# the key's bits, read dims at a time from the top, are spread over one word per axis ("transposed")
+# and a handful of xor passes turn those words into coordinates and back. in 2D it traces exactly
+# the curve hilbertIndexToXY does
+def checkDims(dims, bits):
+    if dims < 1 or bits < 1 or dims * bits > 64:
+        raise ValueError(f"dims * bits must be between 1 and 64, got {dims} * {bits}")
+
+
+def untransposeIndex(transposed, bits):
+    # (n, dims) words -> keys, bit j of axis i becomes key bit j * dims + (dims - 1 - i)
+    dims = transposed.shape[1]
+    keys = np.zeros(len(transposed), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(dims):
+            keys |= ((transposed[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(bit * dims + dims - 1 - axis)
+    return keys
+
+
+def transposeIndex(keys, dims, bits):
+    transposed = np.zeros((len(keys), dims), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(dims):
+            transposed[:, axis] |= ((keys >> np.uint64(bit * dims + dims - 1 - axis)) & np.uint64(1)) << np.uint64(bit)
+    return transposed
+
+
+def hilbertIndexToCoords(indices, dims, bits):
+    # keys of a dims dimensional curve with 2 ** bits cells per side -> (n, dims) uint64 coordinates
+    checkDims(dims, bits)
+    keys = np.array(indices, dtype=np.uint64, ndmin=1)
+    if dims * bits < 64 and (keys >> np.uint64(dims * bits)).any():
+        raise ValueError(f"indices must be smaller than 2 ** {dims * bits} for {dims} dims of {bits} bits")
+    x = transposeIndex(keys, dims, bits)
+    # gray decode
+    t = x[:, dims - 1] >> np.uint64(1)
+    for axis in range(dims - 1, 0, -1):
+        x[:, axis] ^= x[:, axis - 1]
+    x[:, 0] ^= t
+    # undo the excess work, lowest bit first
+    for bit in range(1, bits):
+        q, p = np.uint64(1 << bit), np.uint64((1 << bit) - 1)
+        for axis in range(dims - 1, -1, -1):
+            hasBit = (x[:, axis] & q) != 0
+            t = np.where(hasBit, np.uint64(0), (x[:, 0] ^ x[:, axis]) & p)
+            x[:, 0] ^= np.where(hasBit, p, t)
+            x[:, axis] ^= t
+    return x
+
+
+def hilbertCoordsToIndex(coords, bits):
+    # inverse of hilbertIndexToCoords for (n, dims) integer coordinates in [0, 2 ** bits)
+    x = np.array(coords, dtype=np.uint64, ndmin=2).copy()
+    dims = x.shape[1]
+    if not dims:
+        raise ValueError(f"coordinates need at least one axis, got shape {np.shape(coords)}")
+    checkDims(dims, bits)
+    if (x >> np.uint64(bits)).any():
+        raise ValueError(f"coordinates must be smaller than {2 ** bits} for {bits} bits")
+    # inverse undo, highest bit first
+    for bit in range(bits - 1, 0, -1):
+        q, p = np.uint64(1 << bit), np.uint64((1 << bit) - 1)
+        for axis in range(dims):
+            hasBit = (x[:, axis] & q) != 0
+            t = np.where(hasBit, np.uint64(0), (x[:, 0] ^ x[:, axis]) & p)
+            x[:, 0] ^= np.where(hasBit, p, t)
+            x[:, axis] ^= t
+    # gray encode
+    for axis in range(1, dims):
+        x[:, axis] ^= x[:, axis - 1]
+    t = np.zeros(len(x), dtype=np.uint64)
+    for bit in range(bits - 1, 0, -1):
+        t ^= np.where((x[:, dims - 1] & np.uint64(1 << bit)) != 0, np.uint64((1 << bit) - 1), np.uint64(0))
+    x ^= t[:, None]
+    return untransposeIndex(x, bits)
+
+
+def hilbertPointsND(order, dims, startPoint, step):
+    # every vertex of the order `order` curve in dims dimensions as an (n, dims) float array
+    checkDims(dims, order)
+    coords = hilbertIndexToCoords(np.arange(2 ** (order * dims), dtype=np.uint64), dims, order)
+    return np.asarray(startPoint, dtype=float)[:dims] + coords * step
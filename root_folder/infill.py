@@ -0,0 +1,169 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from hilbert import iterHilbertPoints
+
+
+def pointsInPolygon(points, polygon):
+    # even-odd rule, one vectorized pass over all points per polygon edge
+    points = np.asarray(points, dtype=float)
+    polygon = np.asarray(polygon, dtype=float)[:, :2]
+    x, y = points[..., 0], points[..., 1]
+    inside = np.zeros(x.shape, dtype=bool)
+    for (x0, y0), (x1, y1) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if y0 == y1:
+            continue
+        crosses = (y0 > y) != (y1 > y)
+        inside ^= crosses & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+    return inside
+
+
+def curveForPolygon(polygon, spacing):
+    # order, start and step of the smallest Hilbert curve with this line spacing covering the polygon
+    polygon = np.asarray(polygon, dtype=float)[:, :2]
+    low, high = polygon.min(axis=0), polygon.max(axis=0)
+    order = max(1, int(np.ceil(np.log2((high - low).max() / spacing + 1))))
+    reach = (2 ** order - 1) * spacing
+    start = (low + high) / 2 - reach / 2
+    return order, [start[0], start[1], 0], spacing
+
+
+def segmentsCross(starts, ends, polygon):
+    # True where a segment properly crosses an edge of the polygon, one vectorized pass per edge
+    def orient(a, b, c):
+        return (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+
+    crosses = np.zeros(len(starts), dtype=bool)
+    for a, b in zip(polygon, np.roll(polygon, -1, axis=0)):
+        crosses |= (orient(starts, ends, a) * orient(starts, ends, b) < 0) & (orient(a, b, starts) * orient(a, b, ends) < 0)
+    return crosses
+
+
+def infillChunks(polygon, spacing, chunkSize=1 << 16, maxJoin=None):
+    # the curve clipped to the polygon as (points, startsPath) pieces of at most chunkSize vertices.
+    # vertices are streamed from the curve a chunk at a time. a step extrudes when both its ends are
+    # inside and it crosses no edge, so a run of inside vertices is split where a step leaves the
+    # polygon. a run continues the previous path when the move to it is short and passes the same
+    # test, otherwise startsPath is True and the printer travels there first
+    polygon = np.asarray(polygon, dtype=float)[:, :2]
+    maxJoin = 2 * spacing if maxJoin is None else maxJoin
+    order, start, step = curveForPolygon(polygon, spacing)
+    # last extruded vertex, the previous chunk's final vertex when a run ended on it, and whether it was extruded
+    last, previous, emitted = None, None, False
+    for chunk in iterHilbertPoints(order, start, step, chunkSize):
+        chunk = chunk[:, :2]
+        inside = pointsInPolygon(chunk, polygon)
+        carried = previous is not None
+        if carried:
+            chunk = np.vstack([previous, chunk])
+            inside = np.concatenate([[True], inside])
+        extrudes = inside[:-1] & inside[1:]
+        extrudes[extrudes] = ~segmentsCross(chunk[:-1][extrudes], chunk[1:][extrudes], polygon)
+        firsts = np.flatnonzero(inside & ~np.concatenate([[False], extrudes]))
+        stops = np.flatnonzero(inside & ~np.concatenate([extrudes, [False]])) + 1
+        previous = None
+        for first, stop in zip(firsts, stops):
+            if first == 0 and carried and emitted:
+                # the path already ends on this vertex
+                piece, startsPath = chunk[1:stop], False
+            else:
+                piece = chunk[first:stop]
+                startsPath = (
+                    last is None
+                    or np.linalg.norm(piece[0] - last) > maxJoin
+                    or segmentsCross(last[None], piece[:1], polygon)[0]
+                )
+                if startsPath and len(piece) == 1:
+                    # a travel move with nothing to extrude after it, unless the next chunk continues the run
+                    if stop == len(chunk):
+                        previous, emitted = piece[0], False
+                    continue
+            if len(piece):
+                yield piece, startsPath
+                last = piece[-1]
+            if stop == len(chunk):
+                previous, emitted = last, True
+
+
+def infillPaths(polygon, spacing, **kwargs):
+    # whole paths as (n, 2) arrays, for when they fit in memory, e.g. in a scene
+    path = []
+    for piece, startsPath in infillChunks(polygon, spacing, **kwargs):
+        if startsPath and path:
+            yield np.concatenate(path)
+            path = []
+        path.append(piece)
+    if path:
+        yield np.concatenate(path)
+
+
+def writeGcode(file, chunks, z=0.2, feed=1800, travelFeed=6000, extrusionPerMm=0.033):
+    # absolute moves with cumulative extrusion, one formatted block per chunk
+    file.write(f"G21\nG90\nM82\nG92 E0\nG1 Z{z:.3f} F{travelFeed}\n")
+    extruded, last = 0.0, None
+    for points, startsPath in chunks:
+        if startsPath or last is None:
+            file.write(f"G0 X{points[0, 0]:.3f} Y{points[0, 1]:.3f} F{travelFeed}\nG1 F{feed}\n")
+            last, points = points[0], points[1:]
+            if not len(points):
+                continue
+        lengths = np.linalg.norm(np.diff(np.vstack([last, points]), axis=0), axis=1)
+        amounts = extruded + np.cumsum(lengths) * extrusionPerMm
+        rows = np.column_stack([points, amounts])
+        file.write(("G1 X%.3f Y%.3f E%.5f\n" * len(rows)) % tuple(rows.ravel()))
+        extruded, last = amounts[-1], points[-1]
+
+
+def writeSvg(file, chunks, polygon, strokeWidth=None):
+    # one <path> per extrusion path, y flipped so the bed's origin is bottom left
+    polygon = np.asarray(polygon, dtype=float)[:, :2]
+    low, high = polygon.min(axis=0), polygon.max(axis=0)
+    width, height = high - low
+    strokeWidth = strokeWidth or max(width, height) / 1000
+    file.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{low[0]:.3f} {-high[1]:.3f} {width:.3f} {height:.3f}">\n')
+    outline = " ".join(f"{x:.3f},{-y:.3f}" for x, y in polygon)
+    file.write(f'<polygon points="{outline}" fill="none" stroke="gray" stroke-width="{strokeWidth:.4f}"/>\n')
+    pathOpen = False
+    for points, startsPath in chunks:
+        flipped = points * [1, -1]
+        if startsPath or not pathOpen:
+            if pathOpen:
+                file.write('"/>\n')
+            file.write(f'<path fill="none" stroke="black" stroke-width="{strokeWidth:.4f}" d="M{flipped[0, 0]:.3f},{flipped[0, 1]:.3f}')
+            flipped = flipped[1:]
+            pathOpen = True
+        file.write(("L%.3f,%.3f" * len(flipped)) % tuple(flipped.ravel()))
+    if pathOpen:
+        file.write('"/>\n')
+    file.write("</svg>\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hilbert curve infill for a polygon, streamed to G-code or SVG.")
+    parser.add_argument("output", help=".gcode or .svg")
+    parser.add_argument("--polygon", default="0,0 200,0 200,200 0,200",
+                        help='corners as "x,y x,y ...", or a JSON file with a list of [x, y] pairs')
+    parser.add_argument("--spacing", type=float, default=0.4, help="distance between neighbouring lines")
+    parser.add_argument("--chunk", type=int, default=1 << 16, help="curve vertices generated at a time")
+    args = parser.parse_args()
+
+    if args.polygon.endswith(".json"):
+        with open(args.polygon) as file:
+            polygon = np.array(json.load(file), dtype=float)
+    else:
+        polygon = np.array([[float(value) for value in corner.split(",")] for corner in args.polygon.split()])
+    started = time.perf_counter()
+    chunks = infillChunks(polygon, args.spacing, args.chunk)
+    with open(args.output, "w") as file:
+        if args.output.endswith(".svg"):
+            writeSvg(file, chunks, polygon)
+        else:
+            writeGcode(file, chunks)
+    print(f"wrote {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,77 @@
 from manim import *
-import numpy as np
+import os
 from PIL import Image as PILImage
 from io import BytesIO
+from hilbert import hilbertGridOrder
+from cache import CurveCache
+from paths import ArcLengthIndex
+from animations import IndexedMoveAlongPath, OrderedReveal, OrderedMove, MorphCorners, RefineCurve, RevealRaster
+from construction import constructionSequence, quadrantCentres, QUADRANT_ANGLES
+from colors import setHilbertGradient
+from profiling import PlayProfiler
+from draft import DraftRecorder
+from tiles import loadImageArray, squareCrop, tileViews, TileSource
+from mobjects import LazyImageMobject, RasterCurve
+from assets import AssetPreloader
+from dither import ditherFrames
+from spatial import HilbertIndex
+from manim.constants import QUALITIES, DEFAULT_QUALITY
+
+# curves of this order and up are shown as a RasterCurve instead of a VMobject, RefineCurve chains stop below it
+RASTER_ORDER = 7
+# images the scene shows and how big: "scale" as passed to .scale() on a default ImageMobject,
+# "height" in scene units. they are decoded in the background at that size when a scene starts
+IMAGE_ASSETS = {
+    "Hilbert.png": {"scale": 1},
+    "infill.png": {"scale": 0.2},
+    "infill2.png": {"scale": 0.8},
+    "before.png": {"scale": 1.5},
+    "HilbertMap.png": {"height": 4},
+}
 class DefaultTemplate(MovingCameraScene):
-    def split_map_image(self, filename="HilbertMap.png", rows=4, cols=4, save_crops=False):
-        pil = PILImage.open(filename).convert("RGBA")
-        w, h = pil.size
-        side = min(w, h)
-        # center-crop to square
-        left = (w - side) // 2
-        top = (h - side) // 2
-        pil = pil.crop((left, top, left + side, top + side))
-
-        tile_w = side // cols
-        tile_h = side // rows
-
-        tiles = []
-        for r in range(rows):
-            for c in range(cols):
-                box = (c * tile_w, r * tile_h, (c + 1) * tile_w, (r + 1) * tile_h)
-                crop = pil.crop(box)
-                if save_crops:
-                    crop.save(f"crop_{r}_{c}.png")
-                arr = np.array(crop)  # convert to numpy array for ImageMobject
-                tiles.append(ImageMobject(arr))
+    curveCache = CurveCache()
+    profiler = None
+    draft = None
+
+    def setup(self):
+        self.assets = AssetPreloader(IMAGE_ASSETS, config["pixel_height"], config["frame_height"], QUALITIES[DEFAULT_QUALITY]["pixel_height"])
+        # HILBERT_DRAFT=N only computes N keyframes per play and saves them as contact sheets (see draft.py)
+        if os.environ.get("HILBERT_DRAFT"):
+            self.draft = DraftRecorder(self, int(os.environ["HILBERT_DRAFT"]), int(os.environ.get("HILBERT_DRAFT_WIDTH", 320)))
+        # HILBERT_PROFILE=trace.json records every play/wait into a Chrome trace plus a text summary,
+        # "{scene}" in the path is replaced by the scene class so parallel section renders don't collide
+        if os.environ.get("HILBERT_PROFILE"):
+            self.profiler = PlayProfiler(self)
+    def tear_down(self):
+        logger.info(f"Curve cache: {self.curveCache.hits} hits, {self.curveCache.misses} misses")
+        if self.draft:
+            for path in self.draft.write(os.environ.get("HILBERT_DRAFT_DIR", os.path.join("media", "draft"))):
+                logger.info(f"Draft contact sheet: {path}")
+        if self.profiler:
+            logger.info("Play profile:\n" + self.profiler.write(os.environ["HILBERT_PROFILE"].format(scene=type(self).__name__), int(os.environ.get("HILBERT_PROFILE_TOP", 10))))
+    def loadImage(self, filename):
+        # already scaled as IMAGE_ASSETS says, no .scale() needed
+        pixels, resolution = self.assets.get(filename)
+        return ImageMobject(pixels, scale_to_resolution=resolution)
+    def split_map_image(self, filename="HilbertMap.png", rows=4, cols=4, save_crops=False, lazy=False):
+        if lazy:
+            # tiles read their pixels from a memory mapped copy of the image when first drawn
+            tiles = [LazyImageMobject(TileSource(filename, r, c, rows, cols)) for r in range(rows) for c in range(cols)]
+        else:
+            # decode once, every tile is a view into the same array
+            pixels = self.assets.get(filename)[0] if filename in IMAGE_ASSETS else loadImageArray(filename)
+            views = tileViews(squareCrop(pixels), rows, cols)
+            tiles = []
+            for r in range(rows):
+                for c in range(cols):
+                    if save_crops:
+                        PILImage.fromarray(views[r, c]).save(f"crop_{r}_{c}.png")
+                    tiles.append(ImageMobject(views[r, c]))
 
         grid = Group(*tiles).arrange_in_grid(rows, cols, buff=0).move_to(ORIGIN)
         return grid
     def getHilbertPoints(self, order, startPoint, step):
-        def generatePoints(steps, order):
-            if order <= 1:
-                return steps
-            newString = []
-            A = "+BF-AFA-FB+"
-            B = "-AF+BFB+FA-"
-
-            for char in steps:
-                if char == "A":
-                    newString += A
-                elif char == "B":
-                    newString += B
-                else:
-                    newString += char
-            return generatePoints(newString, order - 1)
-        def getCoordinates(instructions, pointsArray, stepSize):
-            direction = 0  # 0: right, 1: up, 2: left, 3: down
-            for char in instructions:
-                if char == "F":
-                    if direction == 0:
-                        pointsArray.append([pointsArray[-1][0] + stepSize, pointsArray[-1][1], 0])
-                    elif direction == 1:
-                        pointsArray.append([pointsArray[-1][0], pointsArray[-1][1] + stepSize, 0])
-                    elif direction == 2:
-                        pointsArray.append([pointsArray[-1][0] - stepSize, pointsArray[-1][1], 0])
-                    elif direction == 3:
-                        pointsArray.append([pointsArray[-1][0], pointsArray[-1][1] - stepSize, 0])
-                elif char == "+":
-                    direction = (direction + 1) % 4
-                elif char == "-":
-                    direction = (direction - 1) % 4
-            return pointsArray
-
-        return getCoordinates(generatePoints("+BF-AFA-FB+", order), [startPoint], step)
+        return self.curveCache.get(order, startPoint, step)
     def intro(self):
         square = Rectangle(width=8, height=5, color=WHITE).to_edge(UP)
         path = VMobject()
@@ -80,18 +90,20 @@ class DefaultTemplate(MovingCameraScene):
             name.animate.move_to(UP * 7),
             square.animate.move_to(UP * 7)
         )
-    def tableOfContents(self):
-        self.tableOfContents = Text("Table of Contents", font_size=36, weight=BOLD).move_to(ORIGIN + UP * 1.8)
-        line1 = Text("1. History", font_size=28).next_to(self.tableOfContents, DOWN * 2)
+    def buildTableOfContents(self):
+        tableOfContentsTitle = Text("Table of Contents", font_size=36, weight=BOLD).move_to(ORIGIN + UP * 1.8)
+        line1 = Text("1. History", font_size=28).next_to(tableOfContentsTitle, DOWN * 2)
         line2 = Text("2. Construction", font_size=28).next_to(line1, DOWN)
         line3 = Text("3. Applications", font_size=28).next_to(line2, DOWN)
         # line4 = Text("4. Conclusion", font_size=28).next_to(line3, DOWN)
-        self.tableOfContentsGroup = VGroup(self.tableOfContents, line1, line2, line3).arrange(DOWN, center=False, aligned_edge=LEFT)
+        return VGroup(tableOfContentsTitle, line1, line2, line3).arrange(DOWN, center=False, aligned_edge=LEFT)
+    def tableOfContents(self):
+        self.tableOfContentsGroup = self.buildTableOfContents()
         self.play(Write(self.tableOfContentsGroup).set_run_time(2))
         self.wait(5)
     
-    def hilbertHistory(self):
-        hilbertImage = ImageMobject("Hilbert.png").move_to(LEFT * 12)
+    def hilbertHistory(self, highestOrder=5):
+        hilbertImage = self.loadImage("Hilbert.png").move_to(LEFT * 12)
         hilbertLabel = Text("David Hilbert", font_size=24).next_to(hilbertImage, DOWN)
         self.add(hilbertImage, hilbertLabel)
         self.play(
@@ -104,15 +116,16 @@ class DefaultTemplate(MovingCameraScene):
 
         self.play(FadeOut(hilbertLabel), FadeOut(hilbertImage))
         # animate rectangle filling from the bottom to the top
+        historyPalette = [RED, ORANGE, YELLOW, GREEN]
         line = VMobject()
         line.set_points_as_corners([[-4, -2.5, 0], [3, -2.5, 0]]).move_to(ORIGIN)
         curve = VMobject()
         curve.set_points_as_corners(self.getHilbertPoints(3, [-4, -2.5, 0], 0.4125)).move_to(ORIGIN)
-        line.set_color(color_gradient([RED, ORANGE, YELLOW, GREEN], line.get_num_points()))
-        curve.set_color(color_gradient([RED, ORANGE, YELLOW, GREEN], curve.get_num_points()))
+        setHilbertGradient(line, historyPalette)
+        setHilbertGradient(curve, historyPalette)
         higherOrderCurve = VMobject()
         higherOrderCurve.set_points_as_corners(self.getHilbertPoints(4, [-4, -2.5, 0], 0.20625)).move_to(ORIGIN)
-        higherOrderCurve.set_color(color_gradient([RED, ORANGE, YELLOW, GREEN], higherOrderCurve.get_num_points())).move_to(ORIGIN)
+        setHilbertGradient(higherOrderCurve, historyPalette).move_to(ORIGIN)
 
         frame = Square(side_length=curve.get_width()+0.3, color=WHITE).move_to(ORIGIN)
         self.play(
@@ -131,7 +144,7 @@ class DefaultTemplate(MovingCameraScene):
 
         orderLabel = Text("(n is the order of the curve)", font_size=20).move_to(nLabel.get_center() + RIGHT + DOWN * 0.5)
         self.play(
-            Transform(line, higherOrderCurve).set_run_time(2),
+            RefineCurve(line, higherOrderCurve).set_run_time(2),
             FadeIn(frame),
             Write(hilbertCurveFunctionLabel),
             Write(subScript),
@@ -143,10 +156,22 @@ class DefaultTemplate(MovingCameraScene):
             frame.animate.scale(0.5)
         )
         spaceFilling = Text("Space-Filling Curve", font_size=30).to_edge(UP)
-        crazyPoints = self.getHilbertPoints(5, [-4, -2.5, 0], 0.20625)
-        highestOrderCurve = VMobject().set_points_as_corners(crazyPoints).move_to(ORIGIN)
-        highestOrderCurve.set_color(color_gradient([RED, ORANGE, YELLOW, GREEN], highestOrderCurve.get_num_points())).move_to(ORIGIN).scale(0.25)
-        self.play(Write(spaceFilling), Transform(line, highestOrderCurve))
+        # same on-screen size whatever the order, the order 5 curve used to be drawn with step 0.20625 at scale 0.25
+        side = 31 * 0.20625 * 0.25
+        if highestOrder >= RASTER_ORDER:
+            crazyPoints = self.getHilbertPoints(highestOrder, [-4, -2.5, 0], side / (2 ** highestOrder - 1))
+            # too many segments for a VMobject, rasterize once at output resolution and reveal it
+            highestOrderCurve = RasterCurve(crazyPoints, historyPalette).move_to(ORIGIN)
+            self.play(Write(spaceFilling), FadeOut(line), RevealRaster(highestOrderCurve))
+            line = highestOrderCurve
+        else:
+            # one refinement per order from the order 4 line on screen, each vertex splits into four
+            for order in range(5, highestOrder + 1):
+                refinedPoints = self.getHilbertPoints(order, [-4, -2.5, 0], side / (2 ** order - 1))
+                highestOrderCurve = VMobject().set_points_as_corners(refinedPoints).move_to(ORIGIN)
+                setHilbertGradient(highestOrderCurve, historyPalette)
+                animations = [Write(spaceFilling)] if order == 5 else []
+                self.play(*animations, RefineCurve(line, highestOrderCurve))
         notDifferentiable = Text("Not differentiable", color = RED).move_to(DOWN * 2)
 
         self.wait(3)
@@ -164,7 +189,7 @@ class DefaultTemplate(MovingCameraScene):
             FadeOut(orderLabel)
         )
 
-    def hilbertConstruction(self):
+    def hilbertConstruction(self, maxOrder=3):
         hilbertCurveFrame = Rectangle(width=6, height=6, color=YELLOW).move_to(ORIGIN)
         grid = NumberPlane(x_range=[-3, 3, 3], y_range=[-3, 3, 3], background_line_style={"stroke_color": GREY, "stroke_width": 1}).move_to(ORIGIN)
         pointA = Dot(point=hilbertCurveFrame.get_corner(DL).__add__(-DL * 1.5), color=RED)
@@ -218,128 +243,78 @@ class DefaultTemplate(MovingCameraScene):
             ).animate.scale(0.5).to_corner(DL),
         )
         self.wait(3)
-        grid2 = NumberPlane(x_range=[-3, 3, 1.5], y_range=[-3, 3, 1.5], background_line_style={"stroke_color": GREY, "stroke_width": 1}).move_to(ORIGIN)
-        frame2 = Rectangle(width=6, height=6, color=YELLOW).move_to(ORIGIN)
-        order2Label = Text(" Order 2", font_size=30).to_edge(UP)
-        self.play(
-            Create(frame2),
-            Create(grid2),
-            Write(order2Label)
-        )
-
-        copiedOrder1DL = VGroup(connectedPath1.copy(), order1LabelGroup.copy())
-        copiedOrder1UL = VGroup(connectedPath1.copy(), order1LabelGroup.copy())
-        copiedOrder1UR = VGroup(connectedPath1.copy(), order1LabelGroup.copy())
-        copiedOrder1DR = VGroup(connectedPath1.copy(), order1LabelGroup.copy())
-        self.play(
-            LaggedStart(
-                copiedOrder1DL.animate.move_to(grid2.get_center() + DL * 1.5),
-                copiedOrder1UL.animate.move_to(grid2.get_center() + UL * 1.5),
-                copiedOrder1UR.animate.move_to(grid2.get_center() + UR * 1.5),
-                copiedOrder1DR.animate.move_to(grid2.get_center() + DR * 1.5),
-                lag_ratio=0.5
-            )
-        )
-        self.wait(3)
-        self.play(copiedOrder1DL.animate.rotate(-PI/2, about_point= copiedOrder1DL[0].get_center()))
-        self.play(copiedOrder1DL.animate.apply_matrix([[1,0], [0, -1]], about_point = copiedOrder1DL.get_center()))
-        
-        self.play(copiedOrder1DR.animate.rotate(PI/2, about_point= copiedOrder1DR[0].get_center()))
-        self.play(copiedOrder1DR.animate.apply_matrix([[1,0], [0, -1]], about_point = copiedOrder1DR.get_center()))
-
-        order2Line = VMobject()
-        order2Line.set_points_as_corners(
-                copiedOrder1DL[0].get_all_points()    
-        )
-        order2Line.add_points_as_corners(
-            copiedOrder1UL[0].get_all_points(),
-        )
-        order2Line.add_points_as_corners(
-            copiedOrder1UR[0].get_all_points(),
-        )
-        order2Line.add_points_as_corners(
-            copiedOrder1DR[0].get_all_points()
-        )
-
-        order2Line.set_color(ORANGE)
-        
-        self.play(
-            Create(order2Line).set_run_time(5).set_rate_func(linear)
-        )
-
-        order2Group = VGroup(grid2, frame2, order2Label, order2Line)
-        self.play(
-            order2Group.animate.scale(0.5).to_corner(UL),
-            FadeOut(
-                copiedOrder1DL,
-                copiedOrder1DR,
-                copiedOrder1UL,
-                copiedOrder1UR
-            )
-        )
-        grid3 = NumberPlane(x_range=[-3, 3, 0.75], y_range=[-3, 3, 0.75], background_line_style={"stroke_color": GREY, "stroke_width": 1}).move_to(ORIGIN)
-        frame3 = Rectangle(width=6, height=6, color=YELLOW).move_to(ORIGIN)
-        order3Label = Text(" Order 3", font_size=30).to_edge(UP)
-        
-        self.play(
-            Create(frame3),
-            Create(grid3),
-            Write(order3Label)
-        )
-
-        order2CopiedDL = order2Line.copy()
-        order2CopiedUL = order2Line.copy()
-        order2CopiedUR = order2Line.copy()
-        order2CopiedDR = order2Line.copy()
-        self.play(
-            LaggedStart(
-                order2CopiedDL.animate.move_to(grid3.get_center() + DL * 1.5),
-                order2CopiedUL.animate.move_to(grid3.get_center() + UL * 1.5),
-                order2CopiedUR.animate.move_to(grid3.get_center() + UR * 1.5),
-                order2CopiedDR.animate.move_to(grid3.get_center() + DR * 1.5),
-                lag_ratio=0.5
+        constructionColors = [ORANGE, GREEN, BLUE, PURPLE, PINK, TEAL]
+        centres = quadrantCentres(6)
+        previousLine = connectedPath1
+        cornerGroups = []
+        for order, keyframes in constructionSequence(maxOrder, 6):
+            cellSize = 6 / 2 ** order
+            orderGrid = NumberPlane(x_range=[-3, 3, cellSize], y_range=[-3, 3, cellSize], background_line_style={"stroke_color": GREY, "stroke_width": 1}).move_to(ORIGIN)
+            orderFrame = Rectangle(width=6, height=6, color=YELLOW).move_to(ORIGIN)
+            orderLabel = Text(f" Order {order}", font_size=30).to_edge(UP)
+            self.play(
+                Create(orderFrame),
+                Create(orderGrid),
+                Write(orderLabel)
             )
-        )
 
-        self.play(
-            order2CopiedDL.animate.rotate(-PI/2, about_point= order2CopiedDL.get_center()),
-            order2CopiedDR.animate.rotate(PI/2, about_point= order2CopiedDR.get_center()),
-        )
-        self.play(
-            order2CopiedDR.animate.apply_matrix([[1,0], [0, -1]], about_point = order2CopiedDR.get_center()),
-            order2CopiedDL.animate.apply_matrix([[1,0], [0, -1]], about_point = order2CopiedDL.get_center())
-        )
-
-        self.order3Line = VMobject()
-        self.order3Line.set_points_as_corners(
-                order2CopiedDL.get_all_points()
-        )
-        self.order3Line.add_points_as_corners(
-            order2CopiedUL.get_all_points()
-        )
-        self.order3Line.add_points_as_corners(
-            order2CopiedUR.get_all_points()
-        )
-        self.order3Line.add_points_as_corners(
-            order2CopiedDR.get_all_points()
-        )
-        
-        self.order3Line.set_color(GREEN)
-        self.play(
-            Create(self.order3Line).set_run_time(4).set_rate_func(linear),
-            Wait(4.5)
-        )
+            # the quarter copies start from the previous curve's points, every stage after that
+            # is one of the precomputed corner arrays
+            copies = [VMobject().set_points(previousLine.points).match_style(previousLine) for _ in range(4)]
+            moves = [MorphCorners(copy, corners) for copy, corners in zip(copies, keyframes["move"])]
+            labelCopies = []
+            if order == 2:
+                # the numbered order 1 points ride along so the new visiting order can be read off
+                labelCopies = [order1LabelGroup.copy() for _ in range(4)]
+                moves = [
+                    AnimationGroup(move, labels.animate.shift(centre - previousLine.get_center()))
+                    for move, labels, centre in zip(moves, labelCopies, centres)
+                ]
+            self.play(LaggedStart(*moves, lag_ratio=0.5))
+            if order == 2:
+                self.wait(3)
+
+            # the bottom copies turn one at a time the first time round, together after that
+            for quadrants in ([0], [3]) if order == 2 else ([0, 3],):
+                for stage in ["rotate", "reflect"]:
+                    turns = [MorphCorners(copies[q], keyframes[stage][q]) for q in quadrants]
+                    for q in quadrants:
+                        if labelCopies and stage == "rotate":
+                            turns.append(labelCopies[q].animate.rotate(QUADRANT_ANGLES[q], about_point=centres[q]))
+                        elif labelCopies:
+                            turns.append(labelCopies[q].animate.apply_matrix([[1,0], [0, -1]], about_point=centres[q]))
+                    self.play(*turns)
+
+            line = VMobject().set_points_as_corners(keyframes["joined"])
+            line.set_color(constructionColors[(order - 2) % len(constructionColors)])
+            if order > 3:
+                line.set_stroke(width=DEFAULT_STROKE_WIDTH / 2 ** (order - 3))
+            if order < maxOrder:
+                self.play(
+                    Create(line).set_run_time(5).set_rate_func(linear)
+                )
+                orderGroup = VGroup(orderGrid, orderFrame, orderLabel, line)
+                tidyUp = [orderGroup.animate.scale(0.5).to_corner(UL), FadeOut(*copies, *labelCopies)]
+                if cornerGroups:
+                    # only the order just before the one being built stays in the corner
+                    tidyUp.append(FadeOut(cornerGroups.pop()))
+                self.play(*tidyUp)
+                cornerGroups.append(orderGroup)
+                previousLine = line
+            else:
+                self.constructedLine = line
+                self.play(
+                    Create(self.constructedLine).set_run_time(4).set_rate_func(linear),
+                    Wait(4.5)
+                )
         self.play(
             VGroup(
                 order1LabelGroup,
                 hilbertCurveFrame,
                 connectedPath1,
                 grid,
-                grid2,
-                frame2,
-                order2Line,
                 order1Lable,
-                order2Label
+                *cornerGroups
             ).animate.shift(LEFT * 10)
         )
         self.remove(
@@ -347,18 +322,12 @@ class DefaultTemplate(MovingCameraScene):
             hilbertCurveFrame,
             connectedPath1,
             grid,
-            grid2,
-            frame2,
-            order2Line,
             order1Lable,
-            order2Label,
-            grid3,
-            frame3,
-            order3Label,
-            order2CopiedDL,
-            order2CopiedUL,
-            order2CopiedUR,
-            order2CopiedDR
+            *cornerGroups,
+            orderGrid,
+            orderFrame,
+            orderLabel,
+            *copies
         )
         
         singleDimension = NumberLine(
@@ -370,25 +339,26 @@ class DefaultTemplate(MovingCameraScene):
 
         singleDimension.add_labels({0.5: Text("0.5"), 0: Text("0"), 1: Text("1")})
         numberLineDot = Dot(singleDimension.number_to_point(0), color=YELLOW)
-        hilbertCurveDot = Dot(self.order3Line.get_corner(DL), color=YELLOW)
+        hilbertCurveDot = Dot(self.constructedLine.get_corner(DL), color=YELLOW)
         hilbertCurveDot.shift(RIGHT * 3)
         self.play(
-            self.order3Line.animate.shift(RIGHT * 3),
+            self.constructedLine.animate.shift(RIGHT * 3),
             FadeIn(singleDimension, numberLineDot, hilbertCurveDot)
         )
+        curveIndex = ArcLengthIndex(self.constructedLine)
         self.play(
-            MoveAlongPath(hilbertCurveDot, self.order3Line).set_rate_func(linear),
+            IndexedMoveAlongPath(hilbertCurveDot, curveIndex).set_rate_func(linear),
             MoveAlongPath(numberLineDot, singleDimension).set_rate_func(linear),
             run_time = 7
         )
         firstDotPairValue = ValueTracker(0.4)
         firstNLPoint = Dot(singleDimension.number_to_point(0.4), color = ORANGE)
-        first2DPoint = Dot(self.order3Line.points[int(3004 * 0.4)], color = ORANGE) # 3004
+        first2DPoint = Dot(curveIndex.pointFromProportion(0.4), color = ORANGE)
         firstNLPoint.add_updater(lambda dot: dot.move_to(singleDimension.n2p(firstDotPairValue.get_value())))
-        first2DPoint.add_updater(lambda dot: dot.move_to(self.order3Line.points[int(3004 * firstDotPairValue.get_value())]))
+        first2DPoint.add_updater(lambda dot: dot.move_to(curveIndex.pointFromProportion(firstDotPairValue.get_value())))
 
         secondNLPoint = Dot(singleDimension.number_to_point(0.45), color = BLUE)
-        second2DPoint = Dot(self.order3Line.points[int(3004 * 0.45)], color = BLUE)
+        second2DPoint = Dot(curveIndex.pointFromProportion(0.45), color = BLUE)
 
         self.play(
             FadeIn(firstNLPoint, first2DPoint),
@@ -467,14 +437,14 @@ class DefaultTemplate(MovingCameraScene):
             FadeOut(verticalLineLabel),
             FadeOut(propertyLabel),
             FadeOut(possibleSlopeLabel),
-            FadeOut(self.order3Line)
+            FadeOut(self.constructedLine)
         )
 
     
     def applications(self):
         infilTitle = Text("Applications of the Hilbert Curve\n          3D Printing Infill", font_size=36, weight=BOLD).to_edge(UP)
-        infilImage1 = ImageMobject("infill.png").move_to(ORIGIN + RIGHT * 3).scale(0.2)
-        infilImage2 = ImageMobject("infill2.png").move_to(ORIGIN + LEFT * 3).scale(0.8)
+        infilImage1 = self.loadImage("infill.png").move_to(ORIGIN + RIGHT * 3)
+        infilImage2 = self.loadImage("infill2.png").move_to(ORIGIN + LEFT * 3)
         self.play(
             FadeIn(infilImage1, infilImage2).set_run_time(2),
             Write(infilTitle)
@@ -487,8 +457,11 @@ class DefaultTemplate(MovingCameraScene):
             FadeOut(infilImage2),
             FadeOut(infilTitle)
         )
-        beforeImage = ImageMobject("before.png").move_to(ORIGIN + LEFT * 3).scale(1.5)
-        afterImage = ImageMobject("after.png").move_to(ORIGIN + RIGHT * 3).scale(1.5)
+        # the dithered half is computed from before.png at the size it is shown, one dot per output pixel
+        pixels, resolution = self.assets.get("before.png")
+        before, after = ditherFrames(pixels)
+        beforeImage = ImageMobject(before, scale_to_resolution=resolution).move_to(ORIGIN + LEFT * 3)
+        afterImage = ImageMobject(after, scale_to_resolution=resolution).move_to(ORIGIN + RIGHT * 3)
         compressionTitle = Text("Dithering", font_size=36, weight=BOLD).to_edge(UP)
         self.play(
             FadeIn(beforeImage, afterImage).set_run_time(2),
@@ -501,12 +474,12 @@ class DefaultTemplate(MovingCameraScene):
             FadeOut(compressionTitle)
         )
 
-        tiled_map = self.split_map_image("HilbertMap.png", rows=4, cols=4)
+        mapRows, mapCols = 4, 4
+        tiled_map = self.split_map_image("HilbertMap.png", rows=mapRows, cols=mapCols)
         tiled_map.scale_to_fit_height(4)  # adjust overall visual size
         # self.play(FadeIn(tiled_map, shift=UP), Write(mapTitle))
         # optionally animate tiles individually
-        for tile in tiled_map:
-            self.play(FadeIn(tile), run_time=0.05)
+        self.play(OrderedReveal(tiled_map), run_time=0.05 * len(tiled_map))
         mapTitle = Text("Spatial Indexing in Databases", font_size=36, weight=BOLD).to_edge(UP)
         self.play(
             # FadeIn(tiled_map).set_run_time(2),
@@ -528,16 +501,31 @@ class DefaultTemplate(MovingCameraScene):
             FadeOut(grid),
             FadeOut(hilbertCurve)
         )
-        for index, value in enumerate([12, 13,9,8,4, 0,1, 5, 6,2,3,7,11,10,14,15]):
-            # rearrange to 1D order
-            self.play(
-                tiled_map[value].animate.move_to(LEFT*5 + RIGHT * index * tiled_map[value].get_width() * 0.65).scale(0.65),
-                run_time=0.3
-            )
-
-        self.wait(8)
+        # a real range query over the tile centres, the middle block of the map turns into a few runs
+        # of consecutive keys, which are short stretches of the 1D order
+        tileIndex = HilbertIndex([[col, mapRows - 1 - row] for row in range(mapRows) for col in range(mapCols)], order=2, bounds=(0, 0, mapCols, mapRows))
+        queryLow, queryHigh = [1, 1], [2, 2]
+        queryBox = SurroundingRectangle(Group(*[tiled_map[i] for i in tileIndex.query(queryLow, queryHigh)]), color=YELLOW, buff=0)
+        self.play(Create(queryBox))
+        # rearrange to 1D order
+        tileOrder = hilbertGridOrder(mapRows, mapCols)
+        tileTargets = [LEFT*5 + RIGHT * index * tiled_map[0].get_width() * 0.65 for index in range(len(tileOrder))]
+        self.play(
+            OrderedMove(tiled_map, tileOrder, tileTargets, scale_factor=0.65),
+            FadeOut(queryBox),
+            run_time=0.3 * len(tileOrder)
+        )
+        first, last = tileIndex.rankRuns(queryLow, queryHigh)
+        runBoxes = VGroup(*[
+            SurroundingRectangle(Group(*[tiled_map[tileOrder[rank]] for rank in range(start, stop)]), color=YELLOW, buff=0.05)
+            for start, stop in zip(first, last)
+        ])
+        self.play(Create(runBoxes))
+
+        self.wait(7)
         self.play(
             FadeOut(tiled_map),
+            FadeOut(runBoxes),
             FadeOut(mapTitle)
         )
         # align all these to the left
@@ -562,12 +550,20 @@ class DefaultTemplate(MovingCameraScene):
 
 
 
-    def construct(self):
-        # self.intro() 
+    def enterSection(self, name):
+        # what is on screen when a section starts, so it can be rendered on its own
         self.tableOfContentsGroup = VGroup()
-        # self.tableOfContents()  can shave time here 7s
-        # self.hilbertHistory() # 28s
-        self.hilbertConstruction()# 1:17 ish
-        # self.applications() #37
+        if name == "hilbertHistory":
+            self.tableOfContentsGroup = self.buildTableOfContents()
+            self.add(self.tableOfContentsGroup)
+    def runSection(self, name):
+        self.currentSection = name
+        getattr(self, name)()
 
-        
+    def construct(self):
+        # self.runSection("intro")
+        self.tableOfContentsGroup = VGroup()
+        # self.runSection("tableOfContents")  can shave time here 7s
+        # self.runSection("hilbertHistory") # 28s
+        self.runSection("hilbertConstruction")# 1:17 ish
+        # self.runSection("applications") #37
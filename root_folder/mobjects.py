@@ -0,0 +1,93 @@
+from manim import *
+from manim.mobject.types.image_mobject import AbstractImageMobject
+
+from colors import gradientRGBA, setHilbertGradient
+from hilbert import hilbertPointsND
+from infill import infillPaths
+from raster import RasterPolyline
+
+
+class LazyImageMobject(ImageMobject):
+    # ImageMobject whose pixels are read from a TileSource the first time something asks for them,
+    # so a large tile grid only pulls in the tiles that actually get drawn
+    def __init__(self, source, scale_to_resolution=QUALITIES[DEFAULT_QUALITY]["pixel_height"], **kwargs):
+        self.source = source
+        self.loadedPixels = None
+        # everything ImageMobject.__init__ sets besides the pixels, which it would load right away.
+        # invert_image was called invert before manim 0.19
+        self.fill_opacity = 1
+        self.stroke_opacity = 1
+        self.invert_image = self.invert = False
+        self.image_mode = "RGBA"
+        self.pixel_array_dtype = kwargs.get("pixel_array_dtype", "uint8")
+        AbstractImageMobject.__init__(self, scale_to_resolution, **kwargs)
+
+    @property
+    def pixel_array(self):
+        if self.loadedPixels is None:
+            self.loadedPixels = self.source.load()
+        return self.loadedPixels
+
+    @pixel_array.setter
+    def pixel_array(self, value):
+        self.loadedPixels = value
+
+    def reset_points(self):
+        # same sizing as AbstractImageMobject, but from the tile shape instead of its pixels
+        self.points = np.array([UP + LEFT, UP + RIGHT, DOWN + LEFT, DOWN + RIGHT])
+        self.center()
+        h, w = self.source.shape()[:2]
+        if self.scale_to_resolution:
+            height = h / self.scale_to_resolution * config["frame_height"]
+        else:
+            height = 3
+        self.stretch_to_fit_height(height)
+        self.stretch_to_fit_width(height * w / h)
+        return self
+
+
+class RasterCurve(ImageMobject):
+    # a corner path drawn straight into an RGBA buffer at output resolution. showing it costs one
+    # image blit per frame however many segments it has, and RevealRaster draws it progressively
+    def __init__(self, vertices, palette=(WHITE,), thickness=2, revealed=1, **kwargs):
+        vertices = np.asarray(vertices, dtype=float)
+        pixelsPerUnit = config["pixel_height"] / config["frame_height"]
+        padding = thickness / pixelsPerUnit
+        low = vertices[:, :2].min(axis=0) - padding
+        high = vertices[:, :2].max(axis=0) + padding
+        width = int(np.ceil((high[0] - low[0]) * pixelsPerUnit)) + 1
+        height = int(np.ceil((high[1] - low[1]) * pixelsPerUnit)) + 1
+        pixelVertices = np.column_stack([
+            (vertices[:, 0] - low[0]) * pixelsPerUnit,
+            (high[1] - vertices[:, 1]) * pixelsPerUnit,
+        ])
+        super().__init__(np.zeros((height, width, 4), dtype=np.uint8), scale_to_resolution=config["pixel_height"], **kwargs)
+        self.raster = RasterPolyline(pixelVertices, width, height, gradientRGBA(palette, len(vertices) - 1), thickness, buffer=self.pixel_array)
+        self.move_to([(low[0] + high[0]) / 2, (low[1] + high[1]) / 2, 0])
+        self.reveal(revealed)
+
+    def reveal(self, proportion):
+        # draw the segments up to proportion of the curve, only touching pixels that change
+        self.raster.buffer = self.pixel_array
+        self.raster.reveal(proportion)
+        return self
+
+
+class InfillPaths(VGroup):
+    # Hilbert infill of a polygon given in scene units, one corner path per extrusion path in print order
+    def __init__(self, polygon, spacing, **kwargs):
+        super().__init__()
+        for path in infillPaths(np.asarray(polygon, dtype=float)[:, :2], spacing):
+            if len(path) > 1:
+                self.add(VMobject(**kwargs).set_points_as_corners(np.column_stack([path, np.zeros(len(path))])))
+
+
+class HilbertCurve3D(VMobject):
+    # order n Hilbert curve through a cube of the given side centred on the origin, for a ThreeDScene
+    # version of the construction. consecutive orders line up vertex j with vertex j // 8 like in 2D
+    def __init__(self, order, side=4, palette=None, **kwargs):
+        super().__init__(**kwargs)
+        step = side / (2 ** order - 1)
+        self.set_points_as_corners(hilbertPointsND(order, 3, [-side / 2] * 3, step))
+        if palette:
+            setHilbertGradient(self, palette)
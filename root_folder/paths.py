@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class ArcLengthIndex:
+    # cumulative arc length over the straight segments of a path built with set_points_as_corners.
+    # proportions are stored relative to the total length so they survive shift/scale/rotate,
+    # positions are always read from the mobject's current points
+    def __init__(self, mobject):
+        self.mobject = mobject
+        self.rebuild()
+
+    def rebuild(self):
+        points = self.mobject.points
+        self.stride = getattr(self.mobject, "n_points_per_cubic_curve", 4)
+        self.pointCount = len(points)
+        starts = points[0::self.stride, :2]
+        ends = points[self.stride - 1::self.stride, :2]
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        self.cumulative = np.concatenate([[0.0], np.cumsum(lengths)])
+        self.total = self.cumulative[-1]
+        self.reference = points[[0, -1], :2].copy()
+
+        # bucket segments by midpoint on a grid of the longest segment, so any point lying on
+        # a segment is found in the 3x3 cells around it
+        self.starts, self.ends = starts, ends
+        self.cellSize = lengths.max() if len(lengths) and lengths.max() > 0 else 1.0
+        midpoints = (starts + ends) / 2
+        self.origin = midpoints.min(axis=0) if len(midpoints) else np.zeros(2)
+        cells = np.floor((midpoints - self.origin) / self.cellSize).astype(np.int64)
+        self.columns = int(cells[:, 1].max()) + 3 if len(cells) else 3
+        keys = self.cellKeys(cells)
+        self.segmentOrder = np.argsort(keys, kind="stable")
+        self.sortedKeys = keys[self.segmentOrder]
+
+    def cellKeys(self, cells):
+        return (cells[..., 0] + 1) * self.columns + cells[..., 1] + 1
+
+    def refresh(self):
+        if len(self.mobject.points) != self.pointCount:
+            self.rebuild()
+
+    def pointFromProportion(self, alpha):
+        # O(log n) per proportion, accepts a scalar or an array of proportions
+        self.refresh()
+        alpha = np.clip(np.asarray(alpha, dtype=float), 0, 1)
+        target = alpha * self.total
+        segment = np.searchsorted(self.cumulative, target, side="right") - 1
+        segment = np.clip(segment, 0, len(self.cumulative) - 2)
+        length = self.cumulative[segment + 1] - self.cumulative[segment]
+        offset = target - self.cumulative[segment]
+        t = np.divide(offset, length, out=np.zeros_like(offset), where=length > 0)
+        points = self.mobject.points
+        start = points[segment * self.stride]
+        end = points[segment * self.stride + self.stride - 1]
+        return start + (end - start) * t[..., None]
+
+    def toBuildFrame(self, points):
+        # undo whatever similarity transform moved the path since the index was built
+        current = self.mobject.points[[0, -1], :2]
+        built = self.reference[:, 0] + 1j * self.reference[:, 1]
+        now = current[:, 0] + 1j * current[:, 1]
+        z = points[:, 0] + 1j * points[:, 1]
+        if now[1] != now[0] and built[1] != built[0]:
+            z = (z - now[0]) / (now[1] - now[0]) * (built[1] - built[0]) + built[0]
+        else:
+            z = z - now[0] + built[0]
+        return np.stack([z.real, z.imag], axis=1)
+
+    def proportionFromPoint(self, points):
+        # proportion of the closest spot on the path, for points on or near it
+        self.refresh()
+        points = np.asarray(points, dtype=float)
+        single = points.ndim == 1
+        queries = self.toBuildFrame(np.atleast_2d(points))
+        cells = np.floor((queries - self.origin) / self.cellSize).astype(np.int64)
+        offsets = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+        proportions = np.empty(len(queries))
+        for i, (query, cell) in enumerate(zip(queries, cells)):
+            keys = self.cellKeys(cell + offsets)
+            low = np.searchsorted(self.sortedKeys, keys, side="left")
+            high = np.searchsorted(self.sortedKeys, keys, side="right")
+            candidates = np.concatenate([self.segmentOrder[a:b] for a, b in zip(low, high)])
+            if not len(candidates):
+                candidates = np.arange(len(self.starts))
+            proportions[i] = self.projectOnto(query, candidates)
+        return proportions[0] if single else proportions
+
+    def projectOnto(self, query, candidates):
+        starts, ends = self.starts[candidates], self.ends[candidates]
+        direction = ends - starts
+        lengthSquared = (direction ** 2).sum(axis=1)
+        t = np.divide(((query - starts) * direction).sum(axis=1), lengthSquared, out=np.zeros(len(candidates)), where=lengthSquared > 0)
+        t = np.clip(t, 0, 1)
+        distance = ((starts + direction * t[:, None] - query) ** 2).sum(axis=1)
+        best = np.argmin(distance)
+        segment = candidates[best]
+        along = self.cumulative[segment] + t[best] * (self.cumulative[segment + 1] - self.cumulative[segment])
+        return along / self.total if self.total > 0 else 0.0
+
+
+def cornersToBezier(corners):
+    # the points set_points_as_corners would give: one straight cubic per pair of neighbouring corners,
+    # handles at a third and two thirds of the way along
+    corners = np.asarray(corners, dtype=float)
+    starts, ends = corners[:-1], corners[1:]
+    thirds = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+    return (starts[:, None] + (ends - starts)[:, None] * thirds).reshape(-1, corners.shape[1])
+
+
+def cornerVertices(mobject):
+    # the corners back out of a path built with set_points_as_corners: every segment's start plus the last point
+    stride = getattr(mobject, "n_points_per_cubic_curve", 4)
+    return np.concatenate([mobject.points[::stride], mobject.points[-1:]])
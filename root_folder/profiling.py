@@ -0,0 +1,136 @@
+import json
+import time
+from collections import defaultdict
+
+# renderer stages that get timed inside every play call
+STAGES = ["interpolate", "render", "encode"]
+
+
+class PlayProfiler:
+    # opt-in instrumentation of play/wait on a scene. every call is recorded with its section,
+    # animations, mobject and point counts, frames and the time spent in each renderer stage
+    def __init__(self, scene):
+        self.scene = scene
+        self.origin = time.perf_counter()
+        self.records = []
+        self.spans = []
+        self.current = None
+        self.install()
+
+    def install(self):
+        renderer = self.scene.renderer
+        self.timeStage(self.scene, "update_to_time", "interpolate")
+        self.timeStage(renderer, "update_frame", "render")
+        self.timeStage(renderer.file_writer, "write_frame", "encode")
+        self.scene.play = self.profiled(self.scene.play, "play")
+        self.scene.wait = self.profiled(self.scene.wait, "wait")
+
+    def timeStage(self, owner, name, stage):
+        original = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if self.current is not None:
+                    duration = time.perf_counter() - started
+                    self.current[stage] += duration
+                    self.spans.append((stage, started - self.origin, duration))
+
+        setattr(owner, name, timed)
+
+    def profiled(self, call, kind):
+        def wrapper(*args, **kwargs):
+            # wait goes through play in recent manim versions, only the outer call is recorded
+            if self.current is not None:
+                return call(*args, **kwargs)
+            renderer = self.scene.renderer
+            record = {
+                "kind": kind,
+                "section": getattr(self.scene, "currentSection", "construct"),
+                "index": len(self.records),
+                "start": time.perf_counter() - self.origin,
+                **{stage: 0.0 for stage in STAGES},
+                **self.describe(args),
+            }
+            if kind == "wait":
+                record["animations"] = ["Wait"]
+            timeBefore = renderer.time
+            self.current = record
+            try:
+                return call(*args, **kwargs)
+            finally:
+                self.current = None
+                record["wall"] = time.perf_counter() - self.origin - record["start"]
+                record["cached"] = bool(renderer.skip_animations and not renderer._original_skipping_status)
+                record["frames"] = 0 if record["cached"] else round((renderer.time - timeBefore) * self.scene.camera.frame_rate)
+                self.records.append(record)
+
+        return wrapper
+
+    def describe(self, args):
+        names, mobjects, points = [], 0, 0
+        pending = list(args)
+        while pending:
+            item = pending.pop(0)
+            if hasattr(item, "animations"):
+                pending.extend(item.animations)
+                names.append(type(item).__name__)
+                continue
+            names.append("animate" if type(item).__name__ == "_AnimationBuilder" else type(item).__name__)
+            mobject = getattr(item, "mobject", None)
+            if mobject is not None:
+                family = mobject.get_family()
+                mobjects += len(family)
+                points += sum(len(member.points) for member in family)
+        return {"animations": names, "mobjects": mobjects, "points": points}
+
+    def traceEvents(self):
+        events = []
+        for record in self.records:
+            args = {key: record[key] for key in ["section", "index", "animations", "mobjects", "points", "frames", "cached", *STAGES]}
+            events.append({
+                "name": f"{record['kind']} {record['index']}: {', '.join(record['animations'][:4])}",
+                "cat": record["section"], "ph": "X", "pid": 1, "tid": 1,
+                "ts": record["start"] * 1e6, "dur": record["wall"] * 1e6, "args": args,
+            })
+        for stage, start, duration in self.spans:
+            events.append({"name": stage, "cat": "stage", "ph": "X", "pid": 1, "tid": 1, "ts": start * 1e6, "dur": duration * 1e6})
+        sections = defaultdict(list)
+        for record in self.records:
+            sections[record["section"]].append(record)
+        for section, records in sections.items():
+            start = records[0]["start"]
+            end = records[-1]["start"] + records[-1]["wall"]
+            events.append({"name": section, "cat": "section", "ph": "X", "pid": 1, "tid": 0, "ts": start * 1e6, "dur": (end - start) * 1e6})
+        return events
+
+    def summary(self, top=10):
+        lines = []
+        sections = defaultdict(lambda: defaultdict(float))
+        for record in self.records:
+            for key in ["wall", "frames", *STAGES]:
+                sections[record["section"]][key] += record[key]
+        lines.append(f"{'section':24} {'wall':>9} {'frames':>7} " + " ".join(f"{stage:>11}" for stage in STAGES))
+        for section, totals in sections.items():
+            lines.append(f"{section:24} {totals['wall']:9.2f} {int(totals['frames']):7d} " + " ".join(f"{totals[stage]:11.2f}" for stage in STAGES))
+        lines.append("")
+        lines.append(f"top {top} calls by wall time")
+        for record in sorted(self.records, key=lambda record: record["wall"], reverse=True)[:top]:
+            stages = ", ".join(f"{stage} {record[stage]:.2f}s" for stage in STAGES)
+            cached = " (cached)" if record["cached"] else ""
+            lines.append(
+                f"{record['wall']:8.2f}s {record['section']}#{record['index']} {record['kind']}{cached}: "
+                f"{', '.join(record['animations'])} | {record['mobjects']} mobjects, {record['points']} points, "
+                f"{record['frames']} frames | {stages}"
+            )
+        return "\n".join(lines)
+
+    def write(self, path, top=10):
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.traceEvents(), "displayTimeUnit": "ms"}, file)
+        summary = self.summary(top)
+        with open(path.rsplit(".", 1)[0] + ".txt", "w") as file:
+            file.write(summary + "\n")
+        return summary
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def rasterizePolyline(vertices, width, height, thickness=1):
+    # vertices in pixel coordinates (x right, y down). returns every covered pixel as a flat index
+    # into a width x height image together with the first segment that reaches it, sorted by segment
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    starts, ends = vertices[:-1], vertices[1:]
+    # one sample per pixel step along the longer axis of each segment, all segments at once
+    samples = np.ceil(np.abs(ends - starts).max(axis=1)).astype(np.int64) + 1
+    segment = np.repeat(np.arange(len(starts)), samples)
+    offset = np.arange(samples.sum()) - np.repeat(np.cumsum(samples) - samples, samples)
+    t = offset / np.maximum(samples[segment] - 1, 1)
+    points = np.rint(starts[segment] + (ends[segment] - starts[segment]) * t[:, None]).astype(np.int64)
+
+    # square brush for thicker lines
+    brush = np.arange(thickness) - (thickness - 1) // 2
+    brushX, brushY = np.meshgrid(brush, brush)
+    x = (points[:, 0, None] + brushX.ravel()).ravel()
+    y = (points[:, 1, None] + brushY.ravel()).ravel()
+    segment = np.repeat(segment, thickness * thickness)
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    pixels = y[inside] * width + x[inside]
+    segment = segment[inside]
+
+    # keep the earliest segment per pixel, then order by segment for progressive reveals
+    order = np.lexsort((segment, pixels))
+    pixels, segment = pixels[order], segment[order]
+    first = np.concatenate([[True], pixels[1:] != pixels[:-1]])
+    pixels, segment = pixels[first], segment[first]
+    order = np.argsort(segment, kind="stable")
+    return pixels[order], segment[order]
+
+
+class RasterPolyline:
+    # RGBA buffer of a polyline that can be revealed up to any proportion of its segments.
+    # moving the reveal forward only writes the pixels of newly reached segments
+    def __init__(self, vertices, width, height, segmentColors, thickness=1, buffer=None):
+        self.pixels, self.segments = rasterizePolyline(vertices, width, height, thickness)
+        self.segmentCount = len(vertices) - 1
+        self.colors = np.round(np.asarray(segmentColors)[self.segments] * 255).astype(np.uint8)
+        self.buffer = np.zeros((height, width, 4), dtype=np.uint8) if buffer is None else buffer
+        self.revealed = 0
+
+    def reveal(self, proportion):
+        limit = np.searchsorted(self.segments, proportion * self.segmentCount, side="left")
+        if proportion >= 1:
+            limit = len(self.pixels)
+        flat = self.buffer.reshape(-1, 4)
+        if limit > self.revealed:
+            flat[self.pixels[self.revealed:limit]] = self.colors[self.revealed:limit]
+        elif limit < self.revealed:
+            flat[self.pixels[limit:self.revealed]] = 0
+        self.revealed = limit
+        return self.buffer
@@ -0,0 +1,104 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import SectionCache
+
+# in video order, every name is a DefaultTemplate method
+SECTIONS = ["intro", "tableOfContents", "hilbertHistory", "hilbertConstruction", "applications"]
+QUALITIES = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "p": "production_quality", "k": "fourk_quality"}
+
+
+def sectionScene(name):
+    # a scene that starts from the section's entry state and renders only that section
+    from main import DefaultTemplate
+
+    class SectionScene(DefaultTemplate):
+        def construct(self):
+            self.enterSection(name)
+            self.runSection(name)
+
+    SectionScene.__name__ = SectionScene.__qualname__ = name[0].upper() + name[1:] + "Section"
+    return SectionScene
+
+
+def renderSection(name, quality=None, mediaDir="media"):
+    # runs in a worker process, manim's config is process wide
+    from manim import tempconfig
+
+    options = {"media_dir": mediaDir, "output_file": name}
+    if quality:
+        options["quality"] = QUALITIES[quality]
+    started = time.perf_counter()
+    with tempconfig(options):
+        scene = sectionScene(name)()
+        scene.render()
+        moviePath = str(scene.renderer.file_writer.movie_file_path)
+    return moviePath, time.perf_counter() - started
+
+
+def concatenate(moviePaths, output):
+    if shutil.which("ffmpeg") is None:
+        raise SystemExit("ffmpeg was not found on PATH, it is needed to join the sections")
+    listPath = output + ".txt"
+    with open(listPath, "w") as file:
+        for path in moviePaths:
+            file.write(f"file '{os.path.abspath(path)}'\n")
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listPath, "-c", "copy", output], check=True)
+    os.remove(listPath)
+
+
+def renderSections(names, quality=None, jobs=None, mediaDir="media", output=None, useCache=True):
+    names = [name for name in SECTIONS if name in names]
+    # sections whose code, images and config haven't changed reuse their last video
+    sectionCache = SectionCache(os.path.join(mediaDir, "section_cache"))
+    keys = {name: sectionCache.key(name, quality) for name in names}
+    cached = {name: sectionCache.get(keys[name]) for name in names} if useCache else {}
+    pending = [name for name in names if not cached.get(name)]
+    results = {}
+    if pending:
+        jobs = jobs or min(len(pending), os.cpu_count() or 1)
+        # spawn so every worker gets a clean manim config and cairo state
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            futures = {name: pool.submit(renderSection, name, quality, mediaDir) for name in pending}
+            results = {name: future.result() for name, future in futures.items()}
+    moviePaths = []
+    for name in names:
+        if name in results:
+            path, seconds = results[name]
+            sectionCache.put(keys[name], path)
+            print(f"{name}: {seconds:.1f}s -> {path}")
+        else:
+            path = cached[name]
+            print(f"{name}: cached -> {path}")
+        moviePaths.append(path)
+    if output:
+        concatenate(moviePaths, output)
+        print(f"joined {len(moviePaths)} sections into {output}")
+    return moviePaths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render DefaultTemplate sections in parallel and join them with ffmpeg.")
+    parser.add_argument("--sections", default=",".join(SECTIONS), help=f"comma separated subset of {', '.join(SECTIONS)}")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), help="manim quality flag, defaults to manim.cfg")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes, defaults to one per section up to the core count")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("-o", "--output", default="HilbertCurve.mp4", help="joined video, empty to skip joining")
+    parser.add_argument("--no-cache", action="store_true", help="render every section even if an unchanged copy is cached")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.sections.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+    renderSections(names, args.quality, args.jobs, args.media_dir, args.output or None, not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
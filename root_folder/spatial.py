@@ -0,0 +1,93 @@
+import numpy as np
+
+from hilbert import checkOrder, hilbertIndexToXY, hilbertXYToIndex, indexDtype
+
+
+class HilbertIndex:
+    # static 2D point index: points are quantized onto a 2 ** order grid, keyed by their Hilbert
+    # index and kept sorted by key in flat arrays. a rectangle becomes a few runs of consecutive
+    # keys, each found with a binary search
+    def __init__(self, points, order=16, bounds=None):
+        checkOrder(order)
+        points = np.asarray(points, dtype=float)
+        # an empty list has no second axis to slice
+        points = points[:, :2] if points.size else points.reshape(0, 2)
+        self.order = order
+        if bounds is None:
+            bounds = (*points.min(axis=0), *points.max(axis=0)) if len(points) else (0, 0, 1, 1)
+        self.low = np.array(bounds[:2], dtype=float)
+        span = np.array(bounds[2:], dtype=float) - self.low
+        self.scale = (1 << order) / np.where(span > 0, span, 1)
+        keys = self.keys(points)
+        # bulk load: one vectorized keying pass and one sort
+        self.ids = np.argsort(keys, kind="stable")
+        self.sortedKeys = keys[self.ids]
+        self.points = points[self.ids]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def cells(self, points):
+        cells = np.floor((np.asarray(points, dtype=float) - self.low) * self.scale)
+        return np.clip(cells, 0, (1 << self.order) - 1).astype(indexDtype(self.order))
+
+    def keys(self, points):
+        cells = self.cells(points)
+        return hilbertXYToIndex(self.order, cells[..., 0], cells[..., 1])
+
+    def keyRuns(self, low, high, maxRuns=256):
+        # half-open [start, stop) key ranges covering every cell of the rectangle, merged where they
+        # touch. quadrants are refined level by level while the rectangle only partly covers them,
+        # once that would pass maxRuns the partial quadrants are taken whole and filtered afterwards
+        (x0, y0), (x1, y1) = self.cells([low, high]).astype(np.int64)
+        empty = np.empty(0, dtype=np.uint64)
+        if np.any(np.asarray(low, dtype=float) > np.asarray(high, dtype=float)):
+            return empty, empty
+        dtype = indexDtype(self.order)
+        starts, stops = [], []
+        prefixes = np.arange(4, dtype=dtype)
+        for depth in range(1, self.order + 1):
+            side = 1 << (self.order - depth)
+            cx, cy = hilbertIndexToXY(depth, prefixes)
+            cx, cy = cx.astype(np.int64) * side, cy.astype(np.int64) * side
+            overlaps = (cx <= x1) & (cx + side > x0) & (cy <= y1) & (cy + side > y0)
+            inside = (cx >= x0) & (cx + side - 1 <= x1) & (cy >= y0) & (cy + side - 1 <= y1)
+            partial = prefixes[overlaps & ~inside]
+            whole = prefixes[inside]
+            if depth == self.order or sum(map(len, starts)) + len(whole) + 4 * len(partial) > maxRuns:
+                whole = prefixes[overlaps]
+                partial = partial[:0]
+            # 4 ** order itself can be a stop, which needs the wider type
+            whole = whole.astype(np.uint64)
+            starts.append(whole * np.uint64(side * side))
+            stops.append((whole + np.uint64(1)) * np.uint64(side * side))
+            if not len(partial):
+                break
+            prefixes = (partial[:, None] * dtype(4) + np.arange(4, dtype=dtype)).ravel()
+        starts, stops = np.concatenate(starts), np.concatenate(stops)
+        if not len(starts):
+            return empty, empty
+        order = np.argsort(starts)
+        starts, stops = starts[order], stops[order]
+        # join runs that continue each other
+        breaks = np.flatnonzero(np.concatenate([[True], starts[1:] != stops[:-1]]))
+        return starts[breaks], stops[np.append(breaks[1:] - 1, len(stops) - 1)]
+
+    def rankRuns(self, low, high, maxRuns=256):
+        # the key runs as [first, last) positions in the sorted arrays
+        starts, stops = self.keyRuns(low, high, maxRuns)
+        # search in the keys' own type, mixing in uint64 would convert the whole key array per call
+        dtype = self.sortedKeys.dtype
+        return np.searchsorted(self.sortedKeys, starts.astype(dtype), "left"), np.searchsorted(self.sortedKeys, (stops - np.uint64(1)).astype(dtype), "right")
+
+    def query(self, low, high, maxRuns=256):
+        # ids (positions in the points given to the constructor) of the points inside the closed rectangle
+        first, last = self.rankRuns(low, high, maxRuns)
+        counts = last - first
+        if not counts.sum():
+            return np.empty(0, dtype=np.int64)
+        ranks = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        candidates = self.points[ranks]
+        low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+        inside = ((candidates >= low) & (candidates <= high)).all(axis=1)
+        return self.ids[ranks[inside]]
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from animations import OrderedReveal
+
+
+def test_ordered_reveal_fades_images_in():
+    tiles = manim.Group(*[manim.ImageMobject(np.full((4, 4, 4), 255, dtype=np.uint8)) for _ in range(3)])
+    reveal = OrderedReveal(tiles, order=[2, 0, 1], rate_func=manim.linear)
+    reveal.begin()
+    # halfway through the second element of three
+    reveal.interpolate(0.5)
+    assert tiles[2].get_pixel_array()[0, 0, 3] == 255
+    assert tiles[0].get_pixel_array()[0, 0, 3] == 127
+    assert tiles[1] not in reveal.mobject.submobjects
+    reveal.interpolate(1)
+    assert all(tile.get_pixel_array()[0, 0, 3] == 255 for tile in tiles)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from hilbert import hilbertCoordsToIndex, hilbertIndexToCoords, hilbertIndexToXY, hilbertPoints, hilbertXYToIndex, indexDtype
+
+
+def lSystemPoints(order, startPoint, step):
+    # the string rewriting getHilbertPoints used before hilbert.py, kept as the reference
+    steps = "+BF-AFA-FB+"
+    for _ in range(order - 1):
+        steps = "".join({"A": "+BF-AFA-FB+", "B": "-AF+BFB+FA-"}.get(char, char) for char in steps)
+    points = [list(startPoint)]
+    direction = 0  # 0: right, 1: up, 2: left, 3: down
+    for char in steps:
+        if char == "F":
+            dx, dy = [(step, 0), (0, step), (-step, 0), (0, -step)][direction]
+            points.append([points[-1][0] + dx, points[-1][1] + dy, 0])
+        elif char == "+":
+            direction = (direction + 1) % 4
+        elif char == "-":
+            direction = (direction - 1) % 4
+    return np.array(points, dtype=float)
+
+
+@pytest.mark.parametrize("order", range(1, 8))
+def test_matches_l_system(order):
+    startPoint, step = [-4, -2.5, 0], 0.4125
+    np.testing.assert_allclose(hilbertPoints(order, startPoint, step), lSystemPoints(order, startPoint, step))
+
+
+@pytest.mark.parametrize("order", [16, 17])
+def test_round_trip_around_the_uint32_boundary(order):
+    dtype = indexDtype(order)
+    last = 4 ** order - 1
+    edges = np.array([0, 1, 2, 3, 4 ** (order - 1) - 1, 4 ** (order - 1), 2 ** 32 - 1, last - 1, last], dtype=np.uint64)
+    edges = edges[edges <= last]
+    random = np.random.default_rng(order).integers(0, last, 100000, dtype=np.uint64, endpoint=True)
+    indices = np.concatenate([edges, random]).astype(dtype)
+    x, y = hilbertIndexToXY(order, indices)
+    assert x.max() < 2 ** order and y.max() < 2 ** order
+    np.testing.assert_array_equal(hilbertXYToIndex(order, x, y), indices)
+
+
+def test_neighbours_are_one_step_apart():
+    x, y = hilbertIndexToXY(9, np.arange(4 ** 9, dtype=indexDtype(9)))
+    steps = np.abs(np.diff(x.astype(np.int64))) + np.abs(np.diff(y.astype(np.int64)))
+    assert (steps == 1).all()
+
+
+def test_coords_without_axes_are_rejected():
+    with pytest.raises(ValueError, match="at least one axis"):
+        hilbertCoordsToIndex([], 4)
+    with pytest.raises(ValueError, match="at least one axis"):
+        hilbertCoordsToIndex(np.zeros((5, 0)), 4)
+    assert len(hilbertCoordsToIndex(np.zeros((0, 3)), 4)) == 0
+
+
+def test_nd_keys_out_of_range_are_rejected():
+    with pytest.raises(ValueError, match="smaller than 2 \\*\\* 6"):
+        hilbertIndexToCoords([64], 2, 3)
+    keys = np.arange(8 ** 3, dtype=np.uint64)
+    np.testing.assert_array_equal(hilbertCoordsToIndex(hilbertIndexToCoords(keys, 3, 3), 3), keys)
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from mobjects import LazyImageMobject
+from tiles import TileSource
+
+
+def test_lazy_tiles_load_on_first_use(tmp_path):
+    path = str(tmp_path / "map.npy")
+    pixels = np.random.default_rng(0).integers(0, 256, (8, 8, 4), dtype=np.uint8)
+    np.save(path, pixels)
+    # the lazy branch of split_map_image
+    tiles = [LazyImageMobject(TileSource(path, r, c, 2, 2)) for r in range(2) for c in range(2)]
+    grid = manim.Group(*tiles).arrange_in_grid(2, 2, buff=0)
+    assert all(tile.loadedPixels is None for tile in tiles)
+    assert grid.width == pytest.approx(2 * tiles[0].width)
+    np.testing.assert_array_equal(tiles[3].get_pixel_array(), pixels[4:, 4:])
+    tiles[3].set_opacity(0.5)
+    assert (tiles[3].get_pixel_array()[..., 3] == 127).all()
+    assert tiles[0].loadedPixels is None
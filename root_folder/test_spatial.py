@@ -0,0 +1,27 @@
+import numpy as np
+
+from spatial import HilbertIndex
+
+
+def bruteForce(points, low, high):
+    return np.flatnonzero(((points >= low) & (points <= high)).all(axis=1))
+
+
+def test_query_matches_brute_force():
+    points = np.random.default_rng(0).random((5000, 2)) * 100
+    index = HilbertIndex(points, order=10)
+    for low, high in [((10, 20), (30, 25)), ((0, 0), (100, 100)), ((50, 50), (50.5, 51)), ((-5, -5), (1, 1))]:
+        np.testing.assert_array_equal(np.sort(index.query(low, high)), bruteForce(points, low, high))
+
+
+def test_empty_index():
+    index = HilbertIndex([])
+    assert len(index) == 0
+    assert len(index.query((0, 0), (1, 1))) == 0
+
+
+def test_inverted_rectangle_is_empty():
+    index = HilbertIndex(np.random.default_rng(1).random((100, 2)))
+    starts, stops = index.keyRuns((0.8, 0.2), (0.2, 0.8))
+    assert len(starts) == len(stops) == 0
+    assert len(index.query((0.8, 0.8), (0.2, 0.2))) == 0
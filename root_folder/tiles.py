@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from PIL import Image as PILImage
+
+# maps can be far bigger than PIL's decompression bomb limit
+PILImage.MAX_IMAGE_PIXELS = None
+
+
+def loadImageArray(filename):
+    # decode once into an (h, w, 4) uint8 array, .npy files are memory mapped instead
+    if filename.endswith(".npy"):
+        return np.load(filename, mmap_mode="r")
+    return np.asarray(PILImage.open(filename).convert("RGBA"))
+
+
+def squareCrop(pixels):
+    h, w = pixels.shape[:2]
+    side = min(w, h)
+    # center-crop to square
+    left = (w - side) // 2
+    top = (h - side) // 2
+    return pixels[top:top + side, left:left + side]
+
+
+def tileViews(pixels, rows, cols):
+    # (rows, cols, tile_h, tile_w, channels) view onto pixels, nothing is copied
+    tile_h = pixels.shape[0] // rows
+    tile_w = pixels.shape[1] // cols
+    rowStride, colStride = pixels.strides[:2]
+    return as_strided(
+        pixels,
+        shape=(rows, cols, tile_h, tile_w) + pixels.shape[2:],
+        strides=(rowStride * tile_h, colStride * tile_w) + pixels.strides,
+        writeable=False,
+    )
+
+
+def decodedCachePath(filename, directory=os.path.join("media", "tile_cache")):
+    stat = os.stat(filename)
+    name = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(directory, f"{name}-{stat.st_size}-{int(stat.st_mtime)}.npy")
+
+
+def memoryMappedImage(filename):
+    # decode the image a single time into a .npy next to the media output, later runs only map it
+    if filename.endswith(".npy"):
+        return np.load(filename, mmap_mode="r")
+    path = decodedCachePath(filename)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = PILImage.open(filename)
+        partial = f"{path}.{os.getpid()}.partial"
+        pixels = np.lib.format.open_memmap(partial, mode="w+", dtype=np.uint8, shape=(image.height, image.width, 4))
+        # convert in bands so there is never a second full size RGBA copy in memory
+        band = max(1, (64 * 1024 * 1024) // (image.width * 4))
+        for top in range(0, image.height, band):
+            bottom = min(image.height, top + band)
+            pixels[top:bottom] = np.asarray(image.crop((0, top, image.width, bottom)).convert("RGBA"))
+        pixels.flush()
+        del pixels
+        os.replace(partial, path)
+    return np.load(path, mmap_mode="r")
+
+
+class TileSource:
+    # picklable, copy-free handle on one tile of a memory mapped image
+    mapped = {}
+
+    def __init__(self, path, row, col, rows, cols):
+        self.path = path
+        self.row, self.col = row, col
+        self.rows, self.cols = rows, cols
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def shape(self):
+        return tileViews(self.pixels(), self.rows, self.cols).shape[2:]
+
+    def pixels(self):
+        if self.path not in TileSource.mapped:
+            TileSource.mapped[self.path] = squareCrop(memoryMappedImage(self.path))
+        return TileSource.mapped[self.path]
+
+    def load(self):
+        return np.array(tileViews(self.pixels(), self.rows, self.cols)[self.row, self.col])